@@ -3,19 +3,29 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 import re
+import logging
 import time
 from datetime import datetime
 import json
-import base64
 import os
 from urllib.parse import urljoin, urlparse
 import numpy as np
 import concurrent.futures
 import io
 import threading
-from queue import Queue
+import asyncio
+from queue import Queue, Empty
+from collections import namedtuple, deque
 import pickle
+import sqlite3
+import hashlib
+import itertools
+import functools
+import tempfile
+import contextlib
 import webbrowser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Try to import PDF libraries with error handling
 PDF_LIBRARIES_AVAILABLE = False
@@ -41,19 +51,24 @@ try:
     except ImportError:
         FITZ_AVAILABLE = False
     
-    # Try importing textract
-    try:
-        import textract
-        TEXTTRACT_AVAILABLE = True
-    except ImportError:
-        TEXTTRACT_AVAILABLE = False
-    
     PDF_LIBRARIES_AVAILABLE = True
     
 except ImportError as e:
     print(f"Some PDF libraries not available: {e}")
     PDF_LIBRARIES_AVAILABLE = False
 
+# pdfminer (also used by pdfplumber) logs every token it parses; keep only errors
+for _logger_name in ("pdfminer", "pdfplumber"):
+    logging.getLogger(_logger_name).setLevel(logging.ERROR)
+    logging.getLogger(_logger_name).propagate = False
+
+# PDFium text extraction (optional, fastest PDF text parser)
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 # Google Drive API libraries
 GOOGLE_DRIVE_AVAILABLE = False
 try:
@@ -88,18 +103,209 @@ try:
 except ImportError:
     print("Selenium not available. JavaScript-heavy sites will use fallback methods.")
 
+# Streaming Excel writer (optional, falls back to pandas' default engine)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Multi-threaded C++ CSV writer for exports (optional)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Concurrent page downloads (optional, falls back to the thread pool)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# HTTP/2 support for httpx lets same-host requests share one connection
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Faster JSON parsing for large API payloads (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Aho-Corasick matching of multi-word search queries (optional, falls back to the re module)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # For API requests
 import xml.etree.ElementTree as ET
 
-# Page configuration
-st.set_page_config(
-    page_title="Nigeria Stats Web Scraper Pro",
-    page_icon="📊",
-    layout="wide"
+# Statistics patterns, fused into one alternation so text is scanned once
+_STATS_PATTERNS = [
+    ('pct', r'\b\d+\.?\d*\s*%\b'),  # Percentages
+    ('num', r'\b\d{1,3}(?:,\d{3})+\b'),  # Large numbers with commas
+    ('gdp', r'\bGDP.*?\d[,\d]*\.?\d*\b'),  # GDP references
+    ('pop', r'\bpopulation.*?\d[,\d]*\.?\d*\b'),  # Population references
+    ('unemp', r'\bunemployment.*?\d[,\d]*\.?\d*\b'),  # Unemployment references
+    ('inf', r'\binflation.*?\d[,\d]*\.?\d*\b'),  # Inflation references
+    ('qty', r'\b\d+\.?\d*\s*(?:million|billion|thousand)\b'),  # Quantities
+    ('rate', r'\b(?:rate|ratio|percentage|proportion).*?\d+\.?\d*\b')  # Rates and ratios
+]
+_COMBINED_STATS = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in _STATS_PATTERNS),
+    re.IGNORECASE
+)
+
+# Nigerian statistical data patterns for HTML pages
+_NIGERIA_PATTERNS = [
+    # Economic indicators
+    (r'GDP.*?(?:growth|rate|size).*?\d+\.?\d*', 'Economic'),
+    (r'inflation.*?(?:rate|%).*?\d+\.?\d*', 'Economic'),
+    (r'unemployment.*?(?:rate|%).*?\d+\.?\d*', 'Labor'),
+    
+    # Population data
+    (r'population.*?(?:of|in).*?\d+[\d,]*(?:\s*million|\s*billion)?', 'Demographic'),
+    (r'census.*?\d{4}.*?\d+[\d,]*', 'Demographic'),
+    
+    # Health indicators
+    (r'mortality.*?(?:rate|ratio).*?\d+\.?\d*', 'Health'),
+    (r'life.*?expectancy.*?\d+\.?\d*', 'Health'),
+    
+    # Education
+    (r'literacy.*?(?:rate|%).*?\d+\.?\d*', 'Education'),
+    (r'enrollment.*?(?:rate|%).*?\d+\.?\d*', 'Education'),
+    
+    # General statistics
+    (r'\d+\.?\d*\s*%', 'General'),
+    (r'\d{1,3}(?:,\d{3})+', 'General'),
+    (r'\d+\s*(?:million|billion|thousand)', 'General')
+]
+_NIGERIA_GROUPS = {f'p{i}': entry for i, entry in enumerate(_NIGERIA_PATTERNS)}
+_NIGERIA_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, (pattern, _) in _NIGERIA_GROUPS.items()),
+    re.IGNORECASE
+)
+
+def _load_json(content):
+    """Parse a JSON response body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+class _TermAutomaton:
+    """Case-insensitive Aho-Corasick matcher for several terms, with a compiled regex's search()"""
+    
+    def __init__(self, terms):
+        self._automaton = ahocorasick.Automaton()
+        for term in terms:
+            self._automaton.add_word(term.casefold(), term)
+        self._automaton.make_automaton()
+    
+    def search(self, text):
+        return next(self._automaton.iter(text.casefold()), None)
+
+@functools.lru_cache(maxsize=32)
+def _search_query_matcher(search_query):
+    """Build a case-insensitive matcher for any of the words in a search query"""
+    terms = search_query.split()
+    if not terms:
+        return None
+    # One automaton pass finds every term at once; the re alternation retries each term at each position
+    if AHOCORASICK_AVAILABLE and len(terms) > 1:
+        return _TermAutomaton(terms)
+    return re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+
+_DIGITS = frozenset('0123456789')
+_TEXT_STAT_RE = re.compile(r'\d+\.?\d*\s*%|\d+\s*(?:million|billion|thousand)', re.IGNORECASE)
+# Matched on the raw bytes; [^)\n] can't backtrack the way a lazy .*? does on binary streams
+_PDF_STRING_RE = re.compile(rb'\(([^)\n]*)\)')
+# Only the start of the file is scanned for strings in the last-resort PDF text extraction
+_BASIC_PDF_SCAN_BYTES = 1_000_000
+
+# Politeness limits applied separately to each host
+_PER_HOST_CONCURRENCY = 4
+_PER_HOST_REQUESTS_PER_SECOND = 5
+_MAX_RATE_LIMIT_RETRIES = 3
+
+# Upper bound on concurrent headless Chrome instances
+_MAX_SELENIUM_DRIVERS = 3
+
+# Resources Chrome never needs to fetch to render statistics (images, fonts, media, CSS)
+_BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.css'
+]
+
+# Nigerian statistical websites, built once at import
+Website = namedtuple('Website', 'name url scrape_method category priority')
+
+NIGERIAN_STATISTICAL_WEBSITES = (
+    Website('National Bureau of Statistics (NBS)', 'https://www.nigerianstat.gov.ng', 'direct', 'Official Statistics', 1),
+    Website('Central Bank of Nigeria', 'https://www.cbn.gov.ng', 'direct', 'Economic Statistics', 1),
+    Website('World Bank Nigeria Data', 'https://data.worldbank.org/country/nigeria', 'direct', 'International Statistics', 1),
+    Website('IMF Nigeria Economic Indicators', 'https://www.imf.org/en/Countries/NGA', 'direct', 'Economic Statistics', 2),
+    Website('WHO Nigeria Data', 'https://www.who.int/countries/nga', 'direct', 'Health Statistics', 2),
+    Website('NBS Statistical Reports', 'https://nigerianstat.gov.ng/elibrary', 'direct', 'Official Statistics', 1),
+    Website('UN Data Nigeria', 'https://data.un.org/en/iso/ng.html', 'direct', 'International Statistics', 2),
+    Website('NairaMetrics Economic Data', 'https://nairametrics.com', 'direct', 'Economic Statistics', 2)
 )
 
+# Websites grouped by category, so a selection only touches the sites it includes
+_WEBSITES_BY_CATEGORY = {}
+for _website in NIGERIAN_STATISTICAL_WEBSITES:
+    _WEBSITES_BY_CATEGORY.setdefault(_website.category, []).append(_website)
+del _website
+
+@functools.lru_cache(maxsize=32)
+def _websites_for_categories(categories):
+    """Websites in the given categories (all if empty), by priority with one entry per URL"""
+    if categories:
+        websites = list(itertools.chain.from_iterable(_WEBSITES_BY_CATEGORY.get(c, ()) for c in categories))
+    else:
+        websites = list(NIGERIAN_STATISTICAL_WEBSITES)
+    websites.sort(key=lambda w: w.priority)
+    unique_websites = {}
+    for website in websites:
+        unique_websites.setdefault(website.url, website)
+    return tuple(unique_websites.values())
+
+# Parsed PDF results, keyed by URL + ETag/Last-Modified and by file content hash
+PDF_CACHE_DIR = os.path.join("scraped_data", "pdf_cache")
+
+# Scraped records per site and query, with the ETag/Last-Modified they were scraped at
+HTTP_CACHE_DIR = os.path.join("scraped_data", "http_cache")
+
+# Rolling average scrape time per host, used to start the slowest sites first
+HOST_LATENCY_FILE = os.path.join("scraped_data", "host_latency.json")
+_DEFAULT_HOST_LATENCY = 10.0
+
+# PDFs larger than this are skipped rather than downloaded
+DEFAULT_MAX_PDF_MB = 25
+
+# Only the first pages of a PDF are parsed; statistics reports lead with their summary tables
+DEFAULT_MAX_PDF_PAGES = 5
+
+# PDF pages with a content stream this large but this little text are mostly drawings
+_HEAVY_PAGE_STREAM_BYTES = 1024 * 1024
+_SPARSE_PAGE_TEXT_CHARS = 2048
+
+# pdfplumber skips pages with fewer characters than this, and gives each page
+# roughly this many seconds before the remaining pages are dropped
+_MIN_PAGE_CHARS = 20
+_PDFPLUMBER_PAGE_SECONDS = 2
+
 # Custom CSS
-st.markdown("""
+APP_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -152,34 +358,60 @@ st.markdown("""
         font-weight: bold;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+def _init_ui():
+    """Configure the Streamlit page; run only when launched as the app so imports stay UI-free"""
+    st.set_page_config(
+        page_title="Nigeria Stats Web Scraper Pro",
+        page_icon="📊",
+        layout="wide"
+    )
+    st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Thread-safe logging queue
 class ThreadSafeLogger:
-    def __init__(self):
-        self.log_queue = Queue()
-        self.logs = []
+    def __init__(self, maxlen=10000, verbose=True):
+        # A bounded buffer keeps long scrapes from growing memory without limit
+        self.logs = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._logged = 0  # total messages ever added
+        self._read = 0    # messages already returned by get_logs
+        self.verbose = verbose
     
     def add_log(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_message = f"[{timestamp}] {message}"
-        self.log_queue.put(log_message)
-        self.logs.append(log_message)
-        print(log_message)  # Also print to console
+        with self._lock:
+            self.logs.append(log_message)
+            self._logged += 1
+        if self.verbose:
+            print(log_message)  # Also print to console
     
     def get_logs(self):
-        # Get all logs from queue
-        logs = []
-        while not self.log_queue.empty():
-            logs.append(self.log_queue.get())
-        return logs
+        # Get logs added since the last call
+        with self._lock:
+            unread = min(self._logged - self._read, len(self.logs))
+            self._read = self._logged
+            return list(itertools.islice(self.logs, len(self.logs) - unread, None))
     
     def get_all_logs(self):
-        return self.logs
+        with self._lock:
+            return list(self.logs)
 
 # Initialize thread-safe logger
 logger = ThreadSafeLogger()
 
+def _notify(message, level="error"):
+    """Show a message in the Streamlit app, or log it when running outside one"""
+    if st.runtime.exists():
+        getattr(st, level)(message)
+    else:
+        logger.add_log(message)
+
+# Drive uploads are sent resumably in chunks of this size
+DRIVE_UPLOAD_CHUNKSIZE = 8 * 1024 * 1024
+
 class GoogleDriveManager:
     """Manage Google Drive integration"""
     
@@ -195,8 +427,8 @@ class GoogleDriveManager:
         try:
             # Check if credentials file exists
             if not os.path.exists(self.credentials_file):
-                st.warning(f"⚠️ Please create a `{self.credentials_file}` file with your Google Cloud credentials.")
-                st.info("""
+                _notify(f"⚠️ Please create a `{self.credentials_file}` file with your Google Cloud credentials.", "warning")
+                _notify("""
                 **Steps to get credentials:**
                 1. Go to [Google Cloud Console](https://console.cloud.google.com/)
                 2. Create a new project or select existing one
@@ -204,7 +436,7 @@ class GoogleDriveManager:
                 4. Create OAuth 2.0 credentials (Desktop app)
                 5. Download credentials as `credentials.json`
                 6. Place in the same directory as this app
-                """)
+                """, "info")
                 return False
             
             # Load or get new credentials
@@ -230,7 +462,7 @@ class GoogleDriveManager:
             return True
             
         except Exception as e:
-            st.error(f"Google Drive authentication failed: {e}")
+            _notify(f"Google Drive authentication failed: {e}")
             return False
     
     def create_folder(self, folder_name, parent_id=None):
@@ -250,7 +482,7 @@ class GoogleDriveManager:
             
             return folder.get('id')
         except Exception as e:
-            st.error(f"Error creating folder: {e}")
+            _notify(f"Error creating folder: {e}")
             return None
     
     def upload_file(self, file_path, file_name, folder_id=None, mime_type=None):
@@ -268,14 +500,15 @@ class GoogleDriveManager:
             media = MediaFileUpload(
                 file_path,
                 mimetype=mime_type,
+                chunksize=DRIVE_UPLOAD_CHUNKSIZE,
                 resumable=True
             )
             
-            file = self.service.files().create(
+            file = self._execute_upload(self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, webViewLink'
-            ).execute()
+            ))
             
             return {
                 'file_id': file.get('id'),
@@ -284,44 +517,45 @@ class GoogleDriveManager:
             }
             
         except Exception as e:
-            st.error(f"Error uploading file: {e}")
+            _notify(f"Error uploading file: {e}")
             return None
     
+    def _execute_upload(self, request):
+        """Send a resumable upload request chunk by chunk and return the created file"""
+        response = None
+        while response is None:
+            _, response = request.next_chunk(num_retries=3)
+        return response
+    
     def upload_dataframe(self, df, file_name, folder_id=None, format='csv'):
         """Upload a DataFrame directly to Google Drive"""
         try:
-            # Convert DataFrame to bytes
-            if format.lower() == 'csv':
-                data = df.to_csv(index=False).encode('utf-8')
-                mime_type = 'text/csv'
-                file_name = f"{file_name}.csv"
-            elif format.lower() == 'json':
-                data = df.to_json(orient='records', indent=2).encode('utf-8')
-                mime_type = 'application/json'
-                file_name = f"{file_name}.json"
-            elif format.lower() == 'excel':
-                # Save to temporary file
-                temp_file = f"temp_{file_name}.xlsx"
-                df.to_excel(temp_file, index=False)
-                return self.upload_file(temp_file, f"{file_name}.xlsx", folder_id)
+            # Convert DataFrame to bytes (cached, shared with the download buttons)
+            if format.lower() in EXPORT_MIME_TYPES:
+                data = dataframe_to_bytes(df, format.lower())
+                mime_type = EXPORT_MIME_TYPES[format.lower()]
+                file_name = f"{file_name}.{EXPORT_EXTENSIONS[format.lower()]}"
             else:
-                st.error(f"Unsupported format: {format}")
+                _notify(f"Unsupported format: {format}")
                 return None
             
             file_metadata = {'name': file_name}
             if folder_id:
                 file_metadata['parents'] = [folder_id]
             
+            # BytesIO shares the cached bytes rather than copying them
             media = MediaIoBaseUpload(
                 io.BytesIO(data),
-                mimetype=mime_type
+                mimetype=mime_type,
+                chunksize=DRIVE_UPLOAD_CHUNKSIZE,
+                resumable=True
             )
             
-            file = self.service.files().create(
+            file = self._execute_upload(self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, webViewLink'
-            ).execute()
+            ))
             
             return {
                 'file_id': file.get('id'),
@@ -330,7 +564,7 @@ class GoogleDriveManager:
             }
             
         except Exception as e:
-            st.error(f"Error uploading DataFrame: {e}")
+            _notify(f"Error uploading DataFrame: {e}")
             return None
     
     def list_files(self, folder_id=None):
@@ -348,7 +582,7 @@ class GoogleDriveManager:
             
             return results.get('files', [])
         except Exception as e:
-            st.error(f"Error listing files: {e}")
+            _notify(f"Error listing files: {e}")
             return []
     
     def get_folder_id_by_name(self, folder_name):
@@ -364,15 +598,133 @@ class GoogleDriveManager:
                 return files[0]['id']
             return None
         except Exception as e:
-            st.error(f"Error getting folder ID: {e}")
+            _notify(f"Error getting folder ID: {e}")
             return None
 
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _read_pdf_cache_file(path, mtime_ns):
+    """Unpickle a parsed-PDF cache file once per server; a rewritten file has a new mtime and is read again"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def _records_to_frame(records):
+    """Build one DataFrame from a scraper's unique row dicts and the DataFrames (e.g. parsed PDFs) among them"""
+    # Repeated rows are dropped before the frame is built, which is far cheaper than
+    # drop_duplicates hashing every object cell afterwards (and copes with dict values)
+    rows = []
+    seen = set()
+    for record in records:
+        if isinstance(record, dict):
+            key = frozenset((k, str(v)) for k, v in record.items())
+            if key not in seen:
+                seen.add(key)
+                rows.append(record)
+    frames = [record for record in records if isinstance(record, pd.DataFrame)]
+    if rows:
+        frames.insert(0, pd.DataFrame(rows))
+    return pd.concat(frames, ignore_index=True)
+
+class _PrefetchedResponse:
+    """Response downloaded ahead of time by NigerianStatsScraper.prefetch_pages"""
+    
+    def __init__(self, status_code, headers, content, encoding):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+    
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def close(self):
+        pass
+
+def _close_prefetch_result(future):
+    """Close the response a prefetch future resolved to, if the download succeeded"""
+    response = future.result()
+    if response is not None:
+        response.close()
+
+# Content types scrape_with_requests parses itself
+_PARSED_CONTENT_TYPES = ('application/json', 'application/xml', 'text/xml', 'text/html', 'text/plain')
+
+def _is_pdf(content_type, head):
+    """Whether a response is a PDF, by its content type or its leading magic bytes"""
+    # Some servers send PDFs as application/octet-stream or text/html
+    return 'application/pdf' in content_type.lower() or head.startswith(b'%PDF-')
+
+class _HostRateLimiter:
+    """Space out request starts per host, like a token bucket refilled at a fixed rate"""
+    
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = {}
+        self._lock = threading.Lock()
+    
+    def reserve(self, url):
+        """Reserve the next request slot for the URL's host and return the seconds to wait for it"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
 class NigerianStatsScraper:
     """Enhanced web scraper for Nigerian statistical data with multi-website support"""
     
-    def __init__(self, max_workers=5, use_selenium=False, logger=None):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, max_workers=5, use_selenium=False, logger=None, max_pdf_mb=DEFAULT_MAX_PDF_MB,
+                 preferred_parser=None, deep_pdf_fallback=False, max_pdf_pages=DEFAULT_MAX_PDF_PAGES):
+        self._local = threading.local()
+        self.timeout = 30
+        self.max_workers = max_workers
+        self.max_pdf_bytes = int(max_pdf_mb * 1024 * 1024)
+        self.max_pdf_pages = max_pdf_pages
+        self.preferred_parser = preferred_parser
+        self.deep_pdf_fallback = deep_pdf_fallback
+        self.use_selenium = use_selenium and SELENIUM_AVAILABLE
+        self.logger = logger
+        self._prefetched = {}
+        self.scraped_urls = []
+        
+        # Each scrape_all_websites run gives its worker threads a cancellation Event (in
+        # self._local), set when the run gives up on sites that are still running; those
+        # workers stop at their next check and the run's state is torn down once they return
+        self._abandoned = []
+        
+        # Concurrency and request rate are limited per host rather than only globally
+        self._rate_limiter = _HostRateLimiter(_PER_HOST_REQUESTS_PER_SECOND)
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        
+        self._host_latency = self._load_host_latency()
+        self._latency_lock = threading.Lock()
+        
+        # Selenium drivers are started lazily and shared through a queue
+        self._driver_pool = Queue()
+        self._drivers = []
+        self._driver_lock = threading.Lock()
+        self._max_drivers = min(max_workers, _MAX_SELENIUM_DRIVERS)
+        
+        # Scrape method name -> handler, anything else goes through requests
+        self._scrape_methods = {'api': self.scrape_with_api}
+        if self.use_selenium:
+            self._scrape_methods['selenium'] = self.scrape_with_selenium
+    
+    @property
+    def session(self):
+        """HTTP session for the current thread (requests sessions are not thread-safe)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+        return session
+    
+    def _create_session(self):
+        """Create a requests session with browser headers and connection pooling"""
+        session = requests.Session()
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -380,14 +732,42 @@ class NigerianStatsScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
-        self.timeout = 30
-        self.max_workers = max_workers
-        self.use_selenium = use_selenium and SELENIUM_AVAILABLE
-        self.driver = None
-        self.logger = logger
+        
+        # Keep connections alive across requests, including PDF follow-ups to the same host
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            # Back off on 429/503, honouring the server's Retry-After header
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(429, 503),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    @contextlib.contextmanager
+    def _host_slot(self, url):
+        """Hold one of the URL host's concurrency slots, waiting for its rate limit"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(_PER_HOST_CONCURRENCY)
+                self._host_semaphores[host] = semaphore
+        with semaphore:
+            time.sleep(self._rate_limiter.reserve(url))
+            yield
     
     def log(self, message):
         """Thread-safe logging"""
+        # Workers of an abandoned run stay quiet; the thread running scrape_all_websites keeps logging
+        if self._run_cancelled():
+            return
         if self.logger:
             self.logger.add_log(message)
         else:
@@ -403,228 +783,458 @@ class NigerianStatsScraper:
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--window-size=1920,1080")
             
-            self.driver = webdriver.Chrome(
+            # Government sites are image-heavy; skip images, stylesheets and extensions
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.stylesheets": 2
+            })
+            # Return from get() at DOMContentLoaded instead of waiting for every subresource
+            chrome_options.page_load_strategy = 'eager'
+            
+            driver = webdriver.Chrome(
                 options=chrome_options
             )
-            self.driver.set_page_load_timeout(30)
+            driver.set_page_load_timeout(30)
+            
+            # Abort font, media and CSS requests at the network layer as well
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_RESOURCE_PATTERNS})
+            except Exception as e:
+                self.log(f"Could not enable resource blocking: {e}")
             self.log("Selenium WebDriver initialized successfully")
+            return driver
         except Exception as e:
             self.log(f"Failed to initialize Selenium: {e}")
             self.use_selenium = False
+            return None
+    
+    def _acquire_driver(self):
+        """Take a WebDriver from the pool, starting a new one if the pool is not full"""
+        try:
+            return self._driver_pool.get_nowait()
+        except Empty:
+            pass
+        
+        with self._driver_lock:
+            if not self.use_selenium:
+                return None
+            if len(self._drivers) < self._max_drivers:
+                driver = self.init_selenium()
+                if driver:
+                    self._drivers.append(driver)
+                return driver
+        
+        # Pool is full, wait for another thread to hand a driver back
+        return self._driver_pool.get()
+    
+    def _join_run(self, cancelled):
+        """Executor initializer: mark this worker thread as part of a run stopped by `cancelled`"""
+        self._local.cancelled = cancelled
+    
+    def _init_pdf_worker(self, cancelled, session):
+        """Executor initializer for a page's PDF downloads: join the page's run and reuse its session"""
+        # The short-lived PDF threads would otherwise each open (and abandon) a session of their
+        # own; the page's thread only waits while they run, and these GETs carry no cookies
+        self._join_run(cancelled)
+        self._local.session = session
+    
+    def _run_cancelled(self):
+        """Whether the scrape_all_websites run this thread works for has been abandoned"""
+        cancelled = getattr(self._local, 'cancelled', None)
+        return cancelled is not None and cancelled.is_set()
+    
+    def _when_done(self, futures, callback):
+        """Run callback once all futures have finished, without blocking the caller"""
+        running = [future for future in futures if not future.done()]
+        if not running:
+            callback()
+            return
+        def wait_then_run():
+            concurrent.futures.wait(running)
+            callback()
+        threading.Thread(target=wait_then_run, daemon=True).start()
     
     def close_selenium(self):
         """Close Selenium WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            self.log("Selenium WebDriver closed")
+        # Abandoned scrapes may still hold drivers; quit them once those have returned
+        if any(not future.done() for future in self._abandoned):
+            self._when_done(self._abandoned, self.close_selenium)
+            return
+        with self._driver_lock:
+            for driver in self._drivers:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    self.log(f"Error closing WebDriver: {e}")
+            if self._drivers:
+                self.log(f"Closed {len(self._drivers)} Selenium WebDriver(s)")
+            self._drivers = []
+            self._driver_pool = Queue()
     
-    def scrape_pdf(self, url):
-        """Scrape data from PDF files using available libraries"""
-        pdf_data = []
+    def scrape_pdf(self, url, response=None, head=b''):
+        """Scrape data from PDF files using available libraries
+
+        `response` is an already open, streamed GET of the PDF and `head` any bytes
+        already read from it; the caller closes it. Without one the PDF is downloaded here.
+        """
+        pdf_data = pd.DataFrame()
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
         
         try:
             self.log(f"Scraping PDF: {url}")
             
-            # Download PDF
-            response = self.session.get(url, timeout=self.timeout)
+            # Reuse earlier results if the server reports the same version of the file
+            if response is not None:
+                validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            else:
+                validator = self._get_pdf_validator(url)
+            url_key = f"url:{url}|{validator}" if validator else None
+            if url_key:
+                cached = self._load_cached_pdf(url_key)
+                if cached is not None:
+                    self.log(f"Using cached PDF results for {url}")
+                    return cached
             
-            if response.status_code == 200 and 'application/pdf' in response.headers.get('content-type', '').lower():
-                pdf_content = response.content
-                
-                # List of available PDF parsing methods
-                methods = []
-                
-                # Add available methods
-                if 'pdfplumber' in globals():
-                    methods.append(self._parse_pdf_with_pdfplumber)
-                
-                if 'PyPDF2' in globals():
-                    methods.append(self._parse_pdf_with_pypdf2)
-                
-                if 'pdfminer_extract' in globals():
-                    methods.append(self._parse_pdf_with_pdfminer)
-                
-                if FITZ_AVAILABLE:
-                    methods.append(self._parse_pdf_with_pymupdf)
-                
-                if TEXTTRACT_AVAILABLE:
-                    methods.append(self._parse_pdf_with_textract)
-                
-                # Try methods in order
-                for method in methods:
-                    try:
-                        data = method(pdf_content, url)
-                        if data and len(data) > 0:
-                            pdf_data.extend(data)
-                            self.log(f"Successfully parsed PDF with {method.__name__}")
-                            break
-                    except Exception as e:
-                        self.log(f"PDF parsing method {method.__name__} failed: {e}")
-                        continue
+            # Stream the PDF to a temporary file so the parsers can open it from disk
+            pdf_path = None
+            try:
+                with contextlib.ExitStack() as stack:
+                    if response is None:
+                        stack.enter_context(self._host_slot(url))
+                        response = stack.enter_context(self.session.get(url, timeout=self.timeout, stream=True))
+                    content_length = response.headers.get('content-length', '')
+                    if content_length.isdigit() and int(content_length) > self.max_pdf_bytes:
+                        self.log(f"Skipping PDF larger than {self.max_pdf_bytes // (1024 * 1024)} MB: {url}")
+                    elif response.status_code == 200:
+                        chunks = response.iter_content(chunk_size=65536)
+                        first_chunk = head + next(chunks, b'')
+                        if not _is_pdf(response.headers.get('content-type', ''), first_chunk):
+                            self.log(f"Not a PDF, skipping: {url}")
+                            return pdf_data
+                        content_hash = hashlib.sha1()
+                        size = 0
+                        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                            pdf_path = tmp.name
+                            for chunk in itertools.chain((first_chunk,), chunks):
+                                size += len(chunk)
+                                if size > self.max_pdf_bytes:
+                                    # No (or a wrong) Content-Length, stop once the limit is passed
+                                    oversized = True
+                                    break
+                                tmp.write(chunk)
+                                content_hash.update(chunk)
+                            else:
+                                oversized = False
+                        if oversized:
+                            self.log(f"Skipping PDF larger than {self.max_pdf_bytes // (1024 * 1024)} MB: {url}")
+                            os.unlink(pdf_path)
+                            pdf_path = None
                 
-                # If no method worked, try basic text extraction
-                if not pdf_data:
-                    basic_text = self._extract_basic_pdf_text(pdf_content)
-                    if basic_text:
-                        pdf_data.append({
-                            'PDF_URL': url,
-                            'Content_Type': 'PDF',
-                            'Extracted_Text': basic_text[:1000] + '...' if len(basic_text) > 1000 else basic_text,
-                            'Note': 'Basic text extraction',
-                            'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                        })
+                if pdf_path:
+                    # The same report is often published under several URLs
+                    content_key = f"content:{content_hash.hexdigest()}"
+                    cached = self._load_cached_pdf(content_key)
+                    if cached is not None:
+                        self.log(f"Using cached PDF results for identical file: {url}")
+                        pdf_data = cached.assign(PDF_URL=url)
+                    else:
+                        pdf_data = self._parse_pdf(pdf_path, url, scrape_date)
+                        if not pdf_data.empty:
+                            self._save_cached_pdf(content_key, pdf_data)
+                    
+                    if not pdf_data.empty and url_key:
+                        self._save_cached_pdf(url_key, pdf_data)
+            finally:
+                if pdf_path:
+                    os.unlink(pdf_path)
             
         except Exception as e:
             self.log(f"Error scraping PDF {url}: {e}")
         
         return pdf_data
     
-    def _parse_pdf_with_pdfplumber(self, pdf_content, url):
-        """Parse PDF using pdfplumber"""
-        data = []
+    def _parse_pdf(self, pdf_path, url, scrape_date):
+        """Parse a downloaded PDF file with the fastest available library"""
+        pdf_data = pd.DataFrame()
+        
+        # Text extractors, fastest first; the next one only runs if the previous fails
+        methods = []
+        
+        if PDFIUM_AVAILABLE:
+            methods.append(('pypdfium2', self._extract_pdf_text_pdfium))
+        
+        if FITZ_AVAILABLE:
+            methods.append(('PyMuPDF', self._extract_pdf_text_pymupdf))
+        
+        # pdfminer and PyPDF2 are many times slower, so they are only used when
+        # asked for or when neither fast parser is installed
+        if self.deep_pdf_fallback or not methods or self.preferred_parser in ('pdfminer', 'PyPDF2'):
+            if 'pdfminer_extract' in globals():
+                methods.append(('pdfminer', self._extract_pdf_text_pdfminer))
+            
+            if 'PyPDF2' in globals():
+                methods.append(('PyPDF2', self._extract_pdf_text_pypdf2))
+        
+        if self.preferred_parser:
+            methods.sort(key=lambda method: method[0] != self.preferred_parser)
+        
+        pages = None
+        for parser, method in methods:
+            try:
+                pages, page_count, table_pages = method(pdf_path)
+                self.log(f"Successfully parsed PDF with {parser}")
+                break
+            except Exception as e:
+                self.log(f"PDF parsing method {parser} failed: {e}")
+                continue
+        
+        # If no method worked, try basic text extraction
+        if pages is None:
+            basic_text = self._extract_basic_pdf_text(pdf_path)
+            if basic_text:
+                pdf_data = pd.DataFrame({
+                    'PDF_URL': [url],
+                    'Content_Type': 'PDF',
+                    'Extracted_Text': basic_text[:1000] + '...' if len(basic_text) > 1000 else basic_text,
+                    'Note': 'Basic text extraction',
+                    'Scrape_Date': scrape_date
+                })
+            return pdf_data
+        
+        # Hardly any text on a multi-page PDF usually means a scanned document,
+        # which pdfplumber's layout analysis sometimes recovers
+        if (page_count > 1 and sum(len(text) for _, text in pages) < 100
+                and parser != 'pdfplumber' and 'pdfplumber' in globals()):
+            try:
+                pages, page_count, table_pages = self._extract_pdf_text_pdfplumber(pdf_path)
+                parser = 'pdfplumber'
+            except Exception as e:
+                self.log(f"pdfplumber error: {e}")
+        
+        # Scan the extracted text for statistics once, whichever library produced it
+        page_numbers = []
+        stats_found = []
+        for page_number, text in pages:
+            stats = self._extract_statistics_from_text(text)
+            page_numbers.extend([page_number] * len(stats))
+            stats_found.extend(stat[:200] for stat in stats)
+        
+        pdf_data = pd.DataFrame({
+            'PDF_URL': url,
+            'Page': page_numbers,
+            'Content_Type': 'PDF_statistic',
+            'Extracted_Data': stats_found,
+            'Parser': parser,
+            'Scrape_Date': scrape_date
+        })
+        
+        # pdfplumber is much slower, so only use it for pages that look like tables
+        if table_pages and 'pdfplumber' in globals():
+            try:
+                tables = self._parse_pdf_with_pdfplumber(pdf_path, url, table_pages, scrape_date)
+                pdf_data = pd.concat([pdf_data, tables], ignore_index=True)
+            except Exception as e:
+                self.log(f"pdfplumber error: {e}")
+        
+        return pdf_data
+    
+    def _get_pdf_validator(self, url):
+        """Get the ETag or Last-Modified header of a PDF without downloading it"""
         try:
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                for i, page in enumerate(pdf.pages[:5]):  # Limit to first 5 pages
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 10:
-                        # Extract statistics
-                        stats = self._extract_statistics_from_text(text)
-                        for stat in stats:
-                            data.append({
-                                'PDF_URL': url,
-                                'Page': i + 1,
-                                'Content_Type': 'PDF_statistic',
-                                'Extracted_Data': stat,
-                                'Parser': 'pdfplumber',
-                                'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                            })
+            with self._host_slot(url):
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code == 200:
+                return response.headers.get('ETag') or response.headers.get('Last-Modified')
         except Exception as e:
-            self.log(f"pdfplumber error: {e}")
-        return data
+            self.log(f"Could not check PDF headers for {url}: {e}")
+        return None
     
-    def _parse_pdf_with_pypdf2(self, pdf_content, url):
-        """Parse PDF using PyPDF2"""
-        data = []
+    def _cache_path(self, cache_dir, key):
+        """Cache file path for a cache key"""
+        return os.path.join(cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl")
+    
+    def _load_cache(self, cache_dir, key):
+        """Load a pickled cache entry, or None if not cached"""
+        path = self._cache_path(cache_dir, key)
+        if not os.path.exists(path):
+            return None
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            for i, page in enumerate(pdf_reader.pages[:5]):
-                text = page.extract_text()
-                if text:
-                    stats = self._extract_statistics_from_text(text)
-                    for stat in stats:
-                        data.append({
-                            'PDF_URL': url,
-                            'Page': i + 1,
-                            'Content_Type': 'PDF_text',
-                            'Extracted_Data': stat[:200],
-                            'Parser': 'PyPDF2',
-                            'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                        })
+            with open(path, 'rb') as f:
+                return pickle.load(f)
         except Exception as e:
-            self.log(f"PyPDF2 error: {e}")
-        return data
+            self.log(f"Could not read cache entry: {e}")
+            return None
     
-    def _parse_pdf_with_pdfminer(self, pdf_content, url):
-        """Parse PDF using pdfminer"""
-        data = []
+    def _save_cache(self, cache_dir, key, value):
+        """Pickle a cache entry for later runs"""
         try:
-            text = pdfminer_extract(io.BytesIO(pdf_content))
-            if text:
-                stats = self._extract_statistics_from_text(text)
-                for stat in stats[:20]:  # Limit to 20 statistics
-                    data.append({
-                        'PDF_URL': url,
-                        'Content_Type': 'PDF_statistic',
-                        'Extracted_Data': stat[:300],
-                        'Parser': 'pdfminer',
-                        'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                    })
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(self._cache_path(cache_dir, key), 'wb') as f:
+                pickle.dump(value, f)
         except Exception as e:
-            self.log(f"pdfminer error: {e}")
-        return data
+            self.log(f"Could not write cache entry: {e}")
     
-    def _parse_pdf_with_pymupdf(self, pdf_content, url):
-        """Parse PDF using PyMuPDF (fitz)"""
-        data = []
+    def _load_cached_pdf(self, key):
+        """Load a previously parsed PDF DataFrame, or None if not cached"""
+        path = self._cache_path(PDF_CACHE_DIR, key)
         try:
-            if FITZ_AVAILABLE:
-                doc = fitz.open(stream=pdf_content, filetype="pdf")
-                for i, page in enumerate(doc[:5]):
-                    text = page.get_text()
-                    if text:
-                        lines = text.split('\n')
-                        for line in lines[:50]:  # First 50 lines per page
-                            if re.search(r'\d', line) and len(line.strip()) > 5:
-                                data.append({
-                                    'PDF_URL': url,
-                                    'Page': i + 1,
-                                    'Content_Type': 'PDF_text',
-                                    'Extracted_Line': line.strip()[:200],
-                                    'Parser': 'PyMuPDF',
-                                    'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                                })
+            cached = _read_pdf_cache_file(path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            self.log(f"PyMuPDF error: {e}")
-        return data
+            self.log(f"Could not read cache entry: {e}")
+            return None
+        # Entries written before results were stored as DataFrames are ignored;
+        # the shallow copy keeps callers from adding columns to the shared frame
+        return cached.copy(deep=False) if isinstance(cached, pd.DataFrame) else None
     
-    def _parse_pdf_with_textract(self, pdf_content, url):
-        """Parse PDF using textract"""
-        data = []
+    def _save_cached_pdf(self, key, pdf_data):
+        """Store a parsed PDF DataFrame for later runs"""
+        self._save_cache(PDF_CACHE_DIR, key, pdf_data)
+    
+    def _looks_tabular(self, text):
+        """Check whether page text has the pipe- or tab-separated layout of a table"""
+        return '|' in text or text.count('\t') >= 3
+    
+    def _parse_pdf_with_pdfplumber(self, pdf_path, url, pages, scrape_date):
+        """Extract tables from the given PDF pages using pdfplumber"""
+        page_numbers = []
+        tables = []
+        deadline = time.monotonic() + _PDFPLUMBER_PAGE_SECONDS * len(pages)
+        with pdfplumber.open(pdf_path) as pdf:
+            for i in pages:
+                if time.monotonic() > deadline:
+                    self.log(f"pdfplumber time budget exhausted, skipping remaining pages of {url}")
+                    break
+                page = pdf.pages[i]
+                if len(page.chars) < _MIN_PAGE_CHARS:  # Graphics-only page
+                    continue
+                for table in page.extract_tables():
+                    table_text = self._table_to_text(table)
+                    if table_text:
+                        page_numbers.append(i + 1)
+                        tables.append(table_text)
+        return pd.DataFrame({
+            'PDF_URL': url,
+            'Page': page_numbers,
+            'Content_Type': 'PDF_table',
+            'Extracted_Data': tables,
+            'Parser': 'pdfplumber',
+            'Scrape_Date': scrape_date
+        })
+    
+    def _table_to_text(self, table, limit=500):
+        """Join table cells into a single string, stopping once it exceeds the limit"""
+        parts = []
+        length = 0
+        for row in table:
+            row_text = ' | '.join(map(str, filter(None, row)))
+            if not row_text:
+                continue
+            parts.append(row_text)
+            length += len(row_text) + 3
+            if length > limit:
+                break
+        return ' | '.join(parts)[:limit]
+    
+    def _extract_pdf_text_pdfplumber(self, pdf_path):
+        """Extract page text using pdfplumber, returning (pages, page_count, table_pages)"""
+        pages = []
+        deadline = time.monotonic() + _PDFPLUMBER_PAGE_SECONDS * self.max_pdf_pages
+        with pdfplumber.open(pdf_path) as pdf:
+            for i, page in enumerate(pdf.pages[:self.max_pdf_pages]):
+                if time.monotonic() > deadline:
+                    break
+                if len(page.chars) < _MIN_PAGE_CHARS:  # Graphics-only page
+                    continue
+                text = page.extract_text()
+                if text:
+                    pages.append((i + 1, text))
+            return pages, len(pdf.pages), []
+    
+    def _extract_pdf_text_pypdf2(self, pdf_path):
+        """Extract page text using PyPDF2, returning (pages, page_count, table_pages)"""
+        pages = []
+        pdf_reader = PyPDF2.PdfReader(pdf_path)
+        for i, page in enumerate(pdf_reader.pages[:self.max_pdf_pages]):
+            text = page.extract_text()
+            if text:
+                pages.append((i + 1, text))
+        return pages, len(pdf_reader.pages), []
+    
+    def _extract_pdf_text_pdfminer(self, pdf_path):
+        """Extract document text using pdfminer, returning (pages, page_count, table_pages)"""
+        text = pdfminer_extract(pdf_path, maxpages=self.max_pdf_pages)
+        pages = [(None, text)] if text else []
+        return pages, 1, []
+    
+    def _extract_pdf_text_pdfium(self, pdf_path):
+        """Extract page text using pypdfium2, returning (pages, page_count, table_pages)"""
+        pages = []
+        table_pages = []
+        pdf = pdfium.PdfDocument(pdf_path)
         try:
-            if TEXTTRACT_AVAILABLE:
-                # Save temporarily to file
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
-                    tmp.write(pdf_content)
-                    tmp_path = tmp.name
+            for i in range(min(len(pdf), self.max_pdf_pages)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                
+                if text:
+                    # Same table-page heuristic as PyMuPDF, for the pdfplumber pass
+                    if self._looks_tabular(text) and _COMBINED_STATS.search(text):
+                        table_pages.append(i)
+                    pages.append((i + 1, text))
+            return pages, len(pdf), table_pages
+        finally:
+            pdf.close()
+    
+    def _extract_pdf_text_pymupdf(self, pdf_path):
+        """Extract page text using PyMuPDF (fitz), returning (pages, page_count, table_pages)"""
+        pages = []
+        table_pages = []
+        with fitz.open(pdf_path) as doc:
+            for i, page in enumerate(doc[:self.max_pdf_pages]):
+                # Only keep text blocks (block_type 0), image blocks carry no text
+                text = ''.join(block[4] for block in page.get_text("blocks") if block[6] == 0)
                 
-                text = textract.process(tmp_path).decode('utf-8')
-                os.unlink(tmp_path)
+                # Graphics-heavy pages: huge content stream, hardly any text
+                if len(text) < _SPARSE_PAGE_TEXT_CHARS and len(page.read_contents()) > _HEAVY_PAGE_STREAM_BYTES:
+                    continue
                 
                 if text:
-                    stats = re.findall(r'\b\d+\.?\d*\s*%\b|\b\d{1,3}(?:,\d{3})*\b', text)
-                    for stat in stats[:20]:
-                        data.append({
-                            'PDF_URL': url,
-                            'Content_Type': 'PDF_number',
-                            'Extracted_Number': stat,
-                            'Parser': 'textract',
-                            'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                        })
-        except Exception as e:
-            self.log(f"textract error: {e}")
-        return data
+                    # extract_tables() is expensive, so only run it on table-like
+                    # pages that actually contain statistics
+                    if self._looks_tabular(text) and _COMBINED_STATS.search(text):
+                        table_pages.append(i)
+                    pages.append((i + 1, text))
+            return pages, doc.page_count, table_pages
     
-    def _extract_statistics_from_text(self, text):
-        """Extract statistical patterns from text"""
-        stats = []
-        
-        # Statistical patterns to look for
-        patterns = [
-            r'\b\d+\.?\d*\s*%\b',  # Percentages
-            r'\b\d{1,3}(?:,\d{3})+\b',  # Large numbers with commas
-            r'\bGDP.*?\d[,\d]*\.?\d*\b',  # GDP references
-            r'\bpopulation.*?\d[,\d]*\.?\d*\b',  # Population references
-            r'\bunemployment.*?\d[,\d]*\.?\d*\b',  # Unemployment references
-            r'\binflation.*?\d[,\d]*\.?\d*\b',  # Inflation references
-            r'\b\d+\.?\d*\s*(million|billion|thousand)\b',  # Quantities
-            r'\b(?:rate|ratio|percentage|proportion).*?\d+\.?\d*\b'  # Rates and ratios
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            stats.extend(matches)
-        
-        return list(set(stats))[:50]  # Return unique matches, limit to 50
+    def _extract_statistics_from_text(self, text, limit=50):
+        """Extract up to `limit` distinct statistical patterns from text"""
+        return list(itertools.islice(self._iter_statistics_from_text(text), limit))
     
-    def _extract_basic_pdf_text(self, pdf_content):
+    def _iter_statistics_from_text(self, text):
+        """Yield each distinct statistic in text in page order, scanning only as far as consumed"""
+        seen = set()
+        for match in _COMBINED_STATS.finditer(text):
+            match_text = match.group()
+            if match_text not in seen:
+                seen.add(match_text)
+                yield match_text
+    
+    def _extract_basic_pdf_text(self, pdf_path):
         """Basic text extraction from PDF using available libraries"""
         text = ""
         
         # Try PyPDF2 first
         try:
             if 'PyPDF2' in globals():
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+                pdf_reader = PyPDF2.PdfReader(pdf_path)
                 for page in pdf_reader.pages[:3]:  # First 3 pages only
                     page_text = page.extract_text()
                     if page_text:
@@ -636,94 +1246,296 @@ class NigerianStatsScraper:
         # Try basic string extraction for PDF headers
         try:
             # PDFs often start with "%PDF-" and have text between parentheses
-            pdf_str = pdf_content.decode('latin-1', errors='ignore')
-            # Extract text between parentheses (common in PDFs)
-            matches = re.findall(r'\((.*?)\)', pdf_str)
-            text = ' '.join(matches[:50])  # First 50 matches
+            with open(pdf_path, 'rb') as f:
+                pdf_content = f.read(_BASIC_PDF_SCAN_BYTES)
+            # Extract text between parentheses (common in PDFs), first 50 matches only
+            matches = itertools.islice(_PDF_STRING_RE.finditer(pdf_content), 50)
+            text = ' '.join(match.group(1).decode('latin-1') for match in matches)
         except:
             pass
         
         return text
     
     def scrape_website(self, website_config, search_query):
-        """Scrape a single website based on configuration"""
-        website_data = []
+        """Scrape a single website into a DataFrame based on configuration"""
+        website_df = pd.DataFrame()
+        start_time = time.monotonic()
+        
+        if self._run_cancelled():
+            return website_df
         
         try:
-            url = website_config.get('url', '')
-            name = website_config.get('name', 'Unknown')
-            scrape_method = website_config.get('scrape_method', 'direct')
+            url = website_config.url
+            name = website_config.name
+            scrape_method = website_config.scrape_method
             
             self.log(f"Scraping {name}: {url}")
             
-            if scrape_method == 'selenium' and self.use_selenium:
-                website_data = self.scrape_with_selenium(url, search_query)
-            elif scrape_method == 'api':
-                website_data = self.scrape_with_api(url, search_query)
-            else:
-                website_data = self.scrape_with_requests(url, search_query)
+            # Revalidate pages scraped on an earlier run; a 304 reuses their records
+            cache_key = None
+            if not self._uses_selenium(website_config):
+                cache_key = self._http_cache_key(website_config, search_query)
+                cached = self._load_cache(HTTP_CACHE_DIR, cache_key)
+                response = self._take_prefetched(url)
+                if response is None:
+                    # Streamed, so a PDF's body is left for scrape_pdf and its size limit
+                    with self._host_slot(url):
+                        response = self.session.get(url, timeout=self.timeout, stream=True,
+                                                    headers=self._conditional_headers(cached))
+                if response.status_code == 304 and isinstance(cached.get('data') if cached else None, pd.DataFrame):
+                    response.close()
+                    self.log(f"{name} has not changed since the last scrape, using cached records")
+                    return cached['data']
+                if self._run_cancelled():
+                    response.close()
+                    return website_df
+                # Hand the response to the scraper so the page is not downloaded twice
+                self._prefetched[url] = response
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+            elif self._run_cancelled():
+                return website_df
             
-            # Add source information to all records
-            for item in website_data:
-                item['Source_Website'] = name
-                item['Source_URL'] = url
-                item['Scrape_Method'] = scrape_method
+            scrape = self._scrape_methods.get(scrape_method, self.scrape_with_requests)
+            website_data = scrape(url, search_query)
             
             if website_data:
-                self.log(f"Found {len(website_data)} records from {name}")
+                # Add source information to all records
+                website_df = _records_to_frame(website_data)
+                website_df['Source_Website'] = name
+                website_df['Source_URL'] = url
+                website_df['Scrape_Method'] = scrape_method
+                
+                if cache_key and (etag or last_modified):
+                    self._save_cache(HTTP_CACHE_DIR, cache_key, {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'data': website_df
+                    })
+                
+                self.log(f"Found {len(website_df)} records from {name}")
             else:
                 self.log(f"No data found from {name}")
             
         except Exception as e:
             self.log(f"Error scraping {name}: {str(e)}")
+        finally:
+            self._record_latency(website_config.url, time.monotonic() - start_time)
         
-        return website_data
+        return website_df
+    
+    def _load_host_latency(self):
+        """Load per-host average scrape times saved by earlier runs"""
+        try:
+            with open(HOST_LATENCY_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _finish_run(self, prefetched):
+        """Close a run's unread prefetched responses and persist host latencies"""
+        for response in prefetched.values():
+            if isinstance(response, concurrent.futures.Future):
+                # The download may still be running; close its response once it arrives
+                response.add_done_callback(_close_prefetch_result)
+            else:
+                response.close()
+        prefetched.clear()
+        self._save_host_latency()
+    
+    def _save_host_latency(self):
+        """Persist per-host average scrape times for the next run"""
+        try:
+            os.makedirs(os.path.dirname(HOST_LATENCY_FILE), exist_ok=True)
+            with self._latency_lock:
+                latency = dict(self._host_latency)
+            with open(HOST_LATENCY_FILE, 'w', encoding='utf-8') as f:
+                json.dump(latency, f)
+        except OSError as e:
+            self.log(f"Could not save host latency: {e}")
+    
+    def _record_latency(self, url, elapsed):
+        """Fold a scrape time into the host's exponentially weighted average"""
+        host = urlparse(url).netloc
+        with self._latency_lock:
+            previous = self._host_latency.get(host)
+            self._host_latency[host] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+    
+    def _expected_latency(self, website_config):
+        """Expected scrape time for a website, from its host's history"""
+        return self._host_latency.get(urlparse(website_config.url).netloc, _DEFAULT_HOST_LATENCY)
+    
+    def _uses_selenium(self, website_config):
+        """Whether a website will be rendered in a browser rather than fetched over HTTP"""
+        return website_config.scrape_method == 'selenium' and self.use_selenium
+    
+    def _http_cache_key(self, website_config, search_query):
+        """Key for a website's cached records; results depend on method and query"""
+        return f"{website_config.scrape_method}|{search_query or ''}|{website_config.url}"
+    
+    def _conditional_headers(self, cached):
+        """If-None-Match / If-Modified-Since headers for a cached HTTP entry"""
+        headers = {}
+        # A 304 is only useful with records to reuse; without them the page must be downloaded
+        if cached and isinstance(cached.get('data'), pd.DataFrame):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+    
+    def _fetch(self, url, stream=False):
+        """GET a URL, reusing the response if prefetch_pages already downloaded it"""
+        response = self._take_prefetched(url)
+        if response is not None:
+            return response
+        with self._host_slot(url):
+            return self.session.get(url, timeout=self.timeout, stream=stream)
+    
+    def _take_prefetched(self, url):
+        """Pop the prefetched response for a URL, waiting if its download is still running"""
+        response = self._prefetched.pop(url, None)
+        if isinstance(response, concurrent.futures.Future):
+            response = response.result()  # None if the prefetch failed
+        return response
+
+    def _peek_body(self, response, size=8):
+        """Return the first bytes of a response body without downloading the rest"""
+        if isinstance(response, _PrefetchedResponse):
+            return response.content[:size]
+        return next(response.iter_content(chunk_size=size), b'')
+    
+    def prefetch_pages(self, urls):
+        """Start downloading several pages concurrently with httpx while earlier ones are parsed
+
+        `urls` maps each URL to extra request headers (e.g. conditional GET headers).
+        The downloads run on an event loop in a background thread; each page can be
+        parsed as soon as its own response arrives.
+        """
+        if not HTTPX_AVAILABLE or not urls:
+            return
+        futures = {url: concurrent.futures.Future() for url in urls}
+        self._prefetched.update(futures)
+        threading.Thread(target=self._run_prefetch, args=(urls, futures), daemon=True).start()
+    
+    def _run_prefetch(self, urls, futures):
+        """Run the prefetch event loop, resolving every URL's future even if it fails"""
+        try:
+            asyncio.run(self._prefetch_pages(urls, futures))
+        except Exception as e:
+            self.log(f"Concurrent prefetch failed, fetching pages one by one: {e}")
+        finally:
+            for future in futures.values():
+                if not future.done():
+                    future.set_result(None)
+    
+    async def _prefetch_pages(self, urls, futures):
+        """Fetch all URLs on one httpx client, resolving each URL's future as it completes"""
+        # Same-host URLs go out back to back so they share one HTTP/2 connection
+        ordered = sorted(urls, key=lambda url: urlparse(url).netloc)
+        host_slots = {urlparse(url).netloc: asyncio.Semaphore(_PER_HOST_CONCURRENCY) for url in ordered}
+        
+        async def prefetch(client, url):
+            try:
+                response = await self._prefetch_page(client, url, urls[url], host_slots[urlparse(url).netloc])
+            except Exception:
+                response = None  # The scraper fetches the page itself
+            futures[url].set_result(response)
+        
+        # Keep idle connections long enough for a host's later pages in the same batch
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=httpx.Timeout(self.timeout),
+                                     headers=dict(self.session.headers), follow_redirects=True) as client:
+            await asyncio.gather(*[prefetch(client, url) for url in ordered])
+    
+    async def _prefetch_page(self, client, url, headers, host_slot):
+        """Fetch a single URL for prefetch_pages, backing off when the host returns 429"""
+        for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+            await asyncio.sleep(self._rate_limiter.reserve(url))
+            async with host_slot:
+                async with client.stream('GET', url, headers=headers) as response:
+                    if response.status_code == 429 and attempt < _MAX_RATE_LIMIT_RETRIES:
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = float(retry_after) if retry_after.isdigit() else 0.5 * 2 ** attempt
+                        self.log(f"Rate limited by {urlparse(url).netloc}, retrying in {delay:.1f}s")
+                    else:
+                        content_type = response.headers.get('content-type', '').lower()
+                        # scrape_pdf streams PDFs to disk itself, so leave their body unread
+                        content = b'' if 'application/pdf' in content_type else await response.aread()
+                        return _PrefetchedResponse(response.status_code, response.headers, content, response.charset_encoding)
+            await asyncio.sleep(min(delay, 30))
     
     def scrape_with_requests(self, url, search_query):
         """Scrape website using requests library"""
         data = []
         
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                # Check content type
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'application/pdf' in content_type and PDF_LIBRARIES_AVAILABLE:
-                    # Handle PDF files
-                    pdf_data = self.scrape_pdf(url)
-                    data.extend(pdf_data)
-                
-                elif 'application/json' in content_type:
-                    # Handle JSON APIs
-                    json_data = response.json()
-                    data.extend(self.parse_json_data(json_data, url))
-                
-                elif 'application/xml' in content_type or 'text/xml' in content_type:
-                    # Handle XML data
-                    xml_data = ET.fromstring(response.content)
-                    data.extend(self.parse_xml_data(xml_data, url))
-                
-                elif 'text/html' in content_type:
-                    # Handle HTML pages
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    data.extend(self.extract_html_data(soup, url, search_query))
-                
-                elif 'text/plain' in content_type:
-                    # Handle plain text
-                    text_data = response.text
-                    data.extend(self.parse_text_data(text_data, url))
-                
-                # Check for embedded PDF links
-                if PDF_LIBRARIES_AVAILABLE:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    pdf_links = soup.find_all('a', href=lambda x: x and x.lower().endswith('.pdf'))
+            # Stream so a PDF's body is left to scrape_pdf instead of being downloaded twice
+            with contextlib.closing(self._fetch(url, stream=True)) as response:
+                if response.status_code == 200:
+                    # Check content type
+                    content_type = response.headers.get('content-type', '').lower()
+                    pdf_urls = []
+                    head = b''
+                    
+                    if 'application/pdf' in content_type:
+                        is_pdf = True
+                    elif any(kind in content_type for kind in _PARSED_CONTENT_TYPES):
+                        # The body is read anyway, catch mislabelled PDFs before parsing them as text
+                        is_pdf = response.content.startswith(b'%PDF-')
+                    else:
+                        # Unknown types (e.g. application/octet-stream) are only worth sniffing for a PDF
+                        head = self._peek_body(response)
+                        is_pdf = _is_pdf(content_type, head)
+                    
+                    if is_pdf:
+                        if PDF_LIBRARIES_AVAILABLE:
+                            # Handle PDF files, continuing this download rather than starting another;
+                            # prefetched responses leave a PDF's body unread, so scrape_pdf fetches those
+                            if isinstance(response, requests.Response):
+                                pdf_data = self.scrape_pdf(url, response=response, head=head)
+                            else:
+                                pdf_data = self.scrape_pdf(url)
+                            if not pdf_data.empty:
+                                data.append(pdf_data)
+                    
+                    elif 'application/json' in content_type:
+                        # Handle JSON APIs
+                        json_data = _load_json(response.content)
+                        data.extend(self.parse_json_data(json_data, url))
                     
-                    for link in pdf_links[:2]:  # Limit to 2 PDFs
-                        pdf_url = urljoin(url, link['href'])
-                        pdf_data = self.scrape_pdf(pdf_url)
-                        data.extend(pdf_data)
+                    elif 'application/xml' in content_type or 'text/xml' in content_type:
+                        # Handle XML data
+                        data.extend(self.parse_xml_data(response.content, url))
+                    
+                    elif 'text/html' in content_type:
+                        # Handle HTML pages
+                        soup = BeautifulSoup(response.content, 'lxml')
+                        
+                        # Collect embedded PDF links first, extract_html_data strips nav/footer markup
+                        if PDF_LIBRARIES_AVAILABLE:
+                            # Limit to 2 PDFs, and stop walking the tree once they are found
+                            pdf_links = soup.find_all('a', href=lambda x: x and x.lower().endswith('.pdf'), limit=2)
+                            pdf_urls = [urljoin(url, link['href']) for link in pdf_links]
+                        
+                        data.extend(self.extract_html_data(soup, url, search_query))
+                    
+                    elif 'text/plain' in content_type:
+                        # Handle plain text
+                        text_data = response.text
+                        data.extend(self.parse_text_data(text_data, url))
+                    
+                    # Download the linked PDFs concurrently rather than one after another
+                    if pdf_urls:
+                        # PDF workers belong to the same run as this thread and share its session
+                        with concurrent.futures.ThreadPoolExecutor(
+                            max_workers=len(pdf_urls),
+                            initializer=self._init_pdf_worker,
+                            initargs=(getattr(self._local, 'cancelled', None), self.session)
+                        ) as executor:
+                            # Parsed PDFs are already columnar, keep them as DataFrames
+                            data.extend(pdf_data for pdf_data in executor.map(self.scrape_pdf, pdf_urls)
+                                        if not pdf_data.empty)
         
         except Exception as e:
             self.log(f"Error in requests scraping for {url}: {str(e)}")
@@ -734,22 +1546,27 @@ class NigerianStatsScraper:
         """Scrape JavaScript-heavy websites using Selenium"""
         data = []
         
-        if not self.driver:
+        driver = self._acquire_driver()
+        if not driver:
             return self.scrape_with_requests(url, search_query)  # Fallback
         
         try:
-            self.driver.get(url)
+            driver.get(url)
             time.sleep(2)  # Wait for JavaScript to load
             
             # Get page source after JavaScript execution
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            page_source = driver.page_source
+            self._driver_pool.put(driver)
+            driver = None
+            soup = BeautifulSoup(page_source, 'lxml')
             
             # Extract data
             data.extend(self.extract_html_data(soup, url, search_query))
             
         except Exception as e:
             self.log(f"Selenium scraping error for {url}: {str(e)}")
+            if driver:
+                self._driver_pool.put(driver)
             # Fallback to requests
             data.extend(self.scrape_with_requests(url, search_query))
         
@@ -760,119 +1577,99 @@ class NigerianStatsScraper:
         data = []
         
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'application/json' in content_type:
-                    json_data = response.json()
-                    data.extend(self.parse_json_data(json_data, url))
-                elif 'application/xml' in content_type or 'text/xml' in content_type:
-                    xml_data = ET.fromstring(response.content)
-                    data.extend(self.parse_xml_data(xml_data, url))
+            # scrape_website may hand over a streamed response, release its connection when done
+            with contextlib.closing(self._fetch(url)) as response:
+                if response.status_code == 200:
+                    content_type = response.headers.get('content-type', '').lower()
+                    
+                    if 'application/json' in content_type:
+                        json_data = _load_json(response.content)
+                        data.extend(self.parse_json_data(json_data, url))
+                    elif 'application/xml' in content_type or 'text/xml' in content_type:
+                        data.extend(self.parse_xml_data(response.content, url))
         
         except Exception as e:
             self.log(f"API scraping error for {url}: {str(e)}")
         
         return data
     
+    def _find_nigeria_matches(self, text, limit=5):
+        """Find up to `limit` matches per Nigerian statistics pattern as (group, text) pairs"""
+        matches = []
+        match_counts = {}
+        # Once every pattern has `limit` matches the rest of the page can't add any
+        max_matches = limit * len(_NIGERIA_GROUPS)
+        for match in _NIGERIA_RE.finditer(text):
+            group = match.lastgroup
+            if match_counts.get(group, 0) >= limit:
+                continue
+            match_counts[group] = match_counts.get(group, 0) + 1
+            matches.append((group, match.group()))
+            if len(matches) == max_matches:
+                break
+        return matches
+    
     def extract_html_data(self, soup, url, search_query=None):
         """Extract data from HTML content"""
         data = []
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
+        
+        # Drop boilerplate markup so only page content is scanned
+        for element in soup(['script', 'style', 'noscript', 'nav', 'footer']):
+            element.decompose()
+        
+        # Extract all text and look for statistical patterns; the text nodes are kept
+        # for the paragraph scan below so the tree is only walked once
+        text_nodes = list(soup.strings)
+        all_text = ' '.join(text_nodes)
+        
+        # Look for Nigerian statistical data patterns in a single pass
+        for group, match_text in self._find_nigeria_matches(all_text):
+            pattern, category = _NIGERIA_GROUPS[group]
+            data.append({
+                'Statistical_Match': match_text,
+                'Category': category,
+                'Source_URL': url,
+                'Pattern_Type': pattern,
+                'Scrape_Date': scrape_date
+            })
         
-        # Extract all text and look for statistical patterns
-        all_text = soup.get_text()
-        
-        # Look for Nigerian statistical data patterns
-        nigeria_patterns = [
-            # Economic indicators
-            (r'GDP.*?(?:growth|rate|size).*?\d+\.?\d*', 'Economic'),
-            (r'inflation.*?(?:rate|%).*?\d+\.?\d*', 'Economic'),
-            (r'unemployment.*?(?:rate|%).*?\d+\.?\d*', 'Labor'),
-            
-            # Population data
-            (r'population.*?(?:of|in).*?\d+[\d,]*(?:\s*million|\s*billion)?', 'Demographic'),
-            (r'census.*?\d{4}.*?\d+[\d,]*', 'Demographic'),
-            
-            # Health indicators
-            (r'mortality.*?(?:rate|ratio).*?\d+\.?\d*', 'Health'),
-            (r'life.*?expectancy.*?\d+\.?\d*', 'Health'),
-            
-            # Education
-            (r'literacy.*?(?:rate|%).*?\d+\.?\d*', 'Education'),
-            (r'enrollment.*?(?:rate|%).*?\d+\.?\d*', 'Education'),
-            
-            # General statistics
-            (r'\d+\.?\d*\s*%', 'General'),
-            (r'\d{1,3}(?:,\d{3})+', 'General'),
-            (r'\d+\s*(?:million|billion|thousand)', 'General')
-        ]
+        # Extract tables (common in statistical websites)
+        tables = soup.find_all('table', limit=3)  # First 3 tables
+        for i, table in enumerate(tables):
+            # Read the first rows straight from the parsed tree; read_html(str(table))
+            # would serialize the table and parse it a second time
+            for row_dict in self._table_head_records(table):
+                row_dict['Table_Index'] = i
+                row_dict['Source_URL'] = url
+                row_dict['Content_Type'] = 'HTML_Table'
+                data.append(row_dict)
         
-        for pattern, category in nigeria_patterns:
-            matches = re.findall(pattern, all_text, re.IGNORECASE)
-            for match in matches[:5]:  # Limit to 5 matches per pattern
+        # Extract paragraph text with numbers (likely statistics)
+        paragraphs = (text.strip() for text in text_nodes)
+        paragraphs = itertools.islice((text for text in paragraphs if 20 < len(text) < 500), 20)  # Reasonable length, first 20
+        for text in paragraphs:
+            # Any digit is a match for the number pattern, so a set test is enough
+            if not _DIGITS.isdisjoint(text):
                 data.append({
-                    'Statistical_Match': match,
-                    'Category': category,
+                    'Text_Content': text[:300],
                     'Source_URL': url,
-                    'Pattern_Type': pattern,
-                    'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
+                    'Content_Type': 'HTML_Text',
+                    'Word_Count': len(text.split()),
+                    'Scrape_Date': scrape_date
                 })
         
-        # Extract tables (common in statistical websites)
-        tables = soup.find_all('table')
-        for i, table in enumerate(tables[:3]):  # First 3 tables
-            try:
-                # Try to read table with pandas
-                df_list = pd.read_html(str(table))
-                if df_list:
-                    df = df_list[0]
-                    # Convert first few rows to dictionary
-                    for idx, row in df.head(3).iterrows():
-                        row_dict = row.to_dict()
-                        row_dict['Table_Index'] = i
-                        row_dict['Source_URL'] = url
-                        row_dict['Content_Type'] = 'HTML_Table'
-                        data.append(row_dict)
-            except:
-                # Manual table extraction
-                rows = table.find_all('tr')
-                for row in rows[:5]:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:  # Only if there are data cells
-                        row_data = [cell.get_text(strip=True) for cell in cells]
-                        if any(re.search(r'\d', text) for text in row_data):
-                            data.append({
-                                'Table_Data': ' | '.join(row_data),
-                                'Source_URL': url,
-                                'Content_Type': 'HTML_Table_Raw',
-                                'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                            })
-        
-        # Extract paragraph text with numbers (likely statistics)
-        paragraphs = soup.find_all(['p', 'div', 'span'])
-        for element in paragraphs[:20]:  # First 20 elements
-            text = element.get_text(strip=True)
-            if len(text) > 20 and len(text) < 500:  # Reasonable length
-                if re.search(r'\d+\.?\d*\s*%|\d+[\d,]*\.?\d*', text):
-                    data.append({
-                        'Text_Content': text[:300],
-                        'Source_URL': url,
-                        'Content_Type': 'HTML_Text',
-                        'Word_Count': len(text.split()),
-                        'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
-                    })
-        
         # Filter by search query if provided
-        if search_query and data:
-            filtered_data = []
-            search_terms = search_query.lower().split()
-            for item in data:
-                item_str = str(item).lower()
-                if any(term in item_str for term in search_terms):
-                    filtered_data.append(item)
-            data = filtered_data
+        search_matcher = _search_query_matcher(search_query) if search_query else None
+        # Every record carries this page's Source_URL, so if the URL matches they all
+        # pass; otherwise it is left out of the per-record check
+        if search_matcher and data and not search_matcher.search(url):
+            # Only string values can hold the search terms, so skip str(item)
+            data = [
+                item for item in data
+                if any(isinstance(value, str) and search_matcher.search(value)
+                       for key, value in item.items() if key != 'Source_URL')
+            ]
         
         return data
     
@@ -898,18 +1695,13 @@ class NigerianStatsScraper:
         
         return data
     
-    def parse_xml_data(self, xml_data, url):
-        """Parse XML data"""
+    def parse_xml_data(self, content, url):
+        """Parse an XML response body"""
         data = []
         
         try:
             # Simple XML to dict conversion
-            xml_dict = {}
-            for child in xml_data:
-                if len(child) > 0:
-                    xml_dict[child.tag] = self.xml_to_dict(child)
-                else:
-                    xml_dict[child.tag] = child.text
+            xml_dict = self.xml_to_dict(content)
             
             if xml_dict:
                 xml_dict['Source_URL'] = url
@@ -920,29 +1712,60 @@ class NigerianStatsScraper:
         
         return data
     
-    def xml_to_dict(self, element):
-        """Convert XML element to dictionary"""
+    def xml_to_dict(self, content):
+        """Convert an XML document's root children to a nested dictionary of tag -> dict or text"""
+        # Stream the document and clear each element once converted, so the full tree is never held
+        children_stack = []
         result = {}
-        for child in element:
-            if len(child) > 0:
-                result[child.tag] = self.xml_to_dict(child)
+        for event, element in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+            if event == 'start':
+                children_stack.append({})
+                continue
+            children = children_stack.pop()
+            if not children_stack:
+                result = children  # The root element
             else:
-                result[child.tag] = child.text
+                children_stack[-1][element.tag] = children if children else element.text
+            element.clear()
         return result
     
+    def _table_head_records(self, table, max_rows=3):
+        """First rows of an HTML table as dicts keyed by its header cells (or column numbers)"""
+        rows = [
+            [cell.get_text(strip=True) for cell in tr.find_all(['td', 'th'])]
+            for tr in table.find_all('tr', limit=max_rows + 1)
+        ]
+        rows = [cells for cells in rows if cells]
+        if not rows:
+            return []
+        
+        # A first row made only of <th> cells is the header, as read_html treats it
+        first_row = table.find('tr')
+        if first_row.find('th') is not None and first_row.find('td') is None:
+            headers, rows = rows[0], rows[1:]
+        else:
+            headers, rows = None, rows[:max_rows]
+        
+        return [
+            dict(zip(headers if headers and len(headers) == len(cells) else range(len(cells)), cells))
+            for cells in rows
+        ]
+    
     def parse_text_data(self, text_data, url):
         """Parse plain text data"""
         data = []
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
         
         try:
             lines = text_data.split('\n')
             for line in lines[:50]:  # First 50 lines
-                if re.search(r'\d+\.?\d*\s*%|\d+\s*(?:million|billion|thousand)', line, re.IGNORECASE):
+                # Every statistic contains a digit, so skip the regex for lines without one
+                if not _DIGITS.isdisjoint(line) and _TEXT_STAT_RE.search(line):
                     data.append({
                         'Text_Line': line.strip()[:200],
                         'Source_URL': url,
                         'Data_Type': 'Text',
-                        'Scrape_Date': datetime.now().strftime('%Y-%m-%d')
+                        'Scrape_Date': scrape_date
                     })
         except Exception as e:
             self.log(f"Text parsing error: {str(e)}")
@@ -951,155 +1774,373 @@ class NigerianStatsScraper:
     
     def flatten_dict(self, d, parent_key='', sep='_'):
         """Flatten nested dictionary"""
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        items = {}
+        # Walk nested values with a stack of iterators instead of recursion,
+        # which keeps the original key order
+        stack = [(iter(d.items()), parent_key, False)]
+        while stack:
+            entries, prefix, in_list = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            k, v = entry
+            if in_list:
+                new_key = f"{prefix}_{k}"
+            else:
+                new_key = f"{prefix}{sep}{k}" if prefix else k
             if isinstance(v, dict):
-                items.extend(self.flatten_dict(v, new_key, sep=sep).items())
-            elif isinstance(v, list):
-                for i, item in enumerate(v[:3]):  # Limit to 3 items
-                    if isinstance(item, dict):
-                        items.extend(self.flatten_dict(item, f"{new_key}_{i}", sep=sep).items())
-                    else:
-                        items.append((f"{new_key}_{i}", str(item)))
+                stack.append((iter(v.items()), new_key, False))
+            elif isinstance(v, list) and not in_list:
+                stack.append((enumerate(v[:3]), new_key, True))  # Limit to 3 items
+            elif isinstance(v, (str, int, float)):
+                items[new_key] = v
             else:
-                items.append((new_key, str(v)))
-        return dict(items)
+                items[new_key] = str(v)
+        return items
     
     def get_nigerian_statistical_websites(self):
         """Get comprehensive list of Nigerian statistical websites"""
-        websites = [
-            {
-                'name': 'National Bureau of Statistics (NBS)',
-                'url': 'https://www.nigerianstat.gov.ng',
-                'scrape_method': 'direct',
-                'category': 'Official Statistics',
-                'priority': 1
-            },
-            {
-                'name': 'Central Bank of Nigeria',
-                'url': 'https://www.cbn.gov.ng',
-                'scrape_method': 'direct',
-                'category': 'Economic Statistics',
-                'priority': 1
-            },
-            {
-                'name': 'World Bank Nigeria Data',
-                'url': 'https://data.worldbank.org/country/nigeria',
-                'scrape_method': 'direct',
-                'category': 'International Statistics',
-                'priority': 1
-            },
-            {
-                'name': 'IMF Nigeria Economic Indicators',
-                'url': 'https://www.imf.org/en/Countries/NGA',
-                'scrape_method': 'direct',
-                'category': 'Economic Statistics',
-                'priority': 2
-            },
-            {
-                'name': 'WHO Nigeria Data',
-                'url': 'https://www.who.int/countries/nga',
-                'scrape_method': 'direct',
-                'category': 'Health Statistics',
-                'priority': 2
-            },
-            {
-                'name': 'NBS Statistical Reports',
-                'url': 'https://nigerianstat.gov.ng/elibrary',
-                'scrape_method': 'direct',
-                'category': 'Official Statistics',
-                'priority': 1
-            },
-            {
-                'name': 'UN Data Nigeria',
-                'url': 'https://data.un.org/en/iso/ng.html',
-                'scrape_method': 'direct',
-                'category': 'International Statistics',
-                'priority': 2
-            },
-            {
-                'name': 'NairaMetrics Economic Data',
-                'url': 'https://nairametrics.com',
-                'scrape_method': 'direct',
-                'category': 'Economic Statistics',
-                'priority': 2
-            }
-        ]
-        
-        return websites
+        return NIGERIAN_STATISTICAL_WEBSITES
     
-    def smart_scrape_multiple_websites(self, search_query, selected_categories=None, max_websites=15):
-        """Scrape multiple websites intelligently based on search query and categories"""
-        all_data = []
-        
-        # Get all websites
-        all_websites = self.get_nigerian_statistical_websites()
-        
-        # Filter by categories if specified
-        if selected_categories:
-            filtered_websites = [w for w in all_websites 
-                               if w.get('category') in selected_categories]
-        else:
-            filtered_websites = all_websites
-        
-        # Sort by priority and limit number
-        filtered_websites.sort(key=lambda x: x.get('priority', 99))
-        websites_to_scrape = filtered_websites[:max_websites]
-        
-        self.log(f"Starting multi-website scrape: {len(websites_to_scrape)} websites")
+    def scrape_all_websites(self, website_configs, search_query, time_budget=None, target_records=None):
+        """Scrape several websites concurrently and combine their records into one DataFrame
+
+        Sites still running once `time_budget` seconds have passed or `target_records`
+        records have been collected are abandoned.
+        """
+        frames = []
+        self.scraped_urls = []
+        if not website_configs:
+            return pd.DataFrame()
+        deadline = time.monotonic() + time_budget if time_budget else None
+        
+        # Fresh state per run, so workers still finishing an abandoned earlier run neither
+        # see this run's cancellation nor get their responses closed by its teardown
+        cancelled = threading.Event()
+        prefetched = self._prefetched = {}
+        
+        # Download every non-Selenium page at once in the background; parsing runs on the
+        # thread pool and each site starts as soon as its page has arrived
+        self.prefetch_pages({
+            website.url: self._conditional_headers(
+                self._load_cache(HTTP_CACHE_DIR, self._http_cache_key(website, search_query))
+            )
+            for website in website_configs
+            if not self._uses_selenium(website)
+        })
         
-        # Show website list
-        website_names = [w['name'] for w in websites_to_scrape]
-        self.log(f"Websites to scrape: {', '.join(website_names[:5])}..." if len(website_names) > 5 else f"Websites to scrape: {', '.join(website_names)}")
+        # Submit the slowest sites first so they don't end up running alone at the end
+        website_configs = sorted(website_configs, key=self._expected_latency, reverse=True)
         
         # Use ThreadPoolExecutor for concurrent scraping
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(websites_to_scrape))) as executor:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(website_configs)),
+            initializer=self._join_run,
+            initargs=(cancelled,)
+        )
+        pending = set()
+        try:
             # Submit scraping tasks
             future_to_website = {
                 executor.submit(self.scrape_website, website, search_query): website 
-                for website in websites_to_scrape
+                for website in website_configs
             }
             
             # Collect results as they complete
             completed = 0
-            total = len(websites_to_scrape)
+            total = len(website_configs)
+            total_records = 0
+            pending = set(future_to_website)
             
-            for future in concurrent.futures.as_completed(future_to_website):
-                website = future_to_website[future]
-                completed += 1
+            while pending:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, pending = concurrent.futures.wait(pending, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED)
                 
-                try:
-                    website_data = future.result()
-                    if website_data:
-                        all_data.extend(website_data)
-                        self.log(f"({completed}/{total}) {website['name']}: {len(website_data)} records")
-                    else:
-                        self.log(f"({completed}/{total}) {website['name']}: No data found")
-                except Exception as e:
-                    self.log(f"({completed}/{total}) Error scraping {website['name']}: {str(e)}")
+                for future in done:
+                    website = future_to_website[future]
+                    completed += 1
+                    self.scraped_urls.append(website.url)
+                    
+                    try:
+                        website_df = future.result()
+                        if not website_df.empty:
+                            frames.append(website_df)
+                            total_records += len(website_df)
+                            self.log(f"({completed}/{total}) {website.name}: {len(website_df)} records")
+                        else:
+                            self.log(f"({completed}/{total}) {website.name}: No data found")
+                    except Exception as e:
+                        self.log(f"({completed}/{total}) Error scraping {website.name}: {str(e)}")
+                
+                if pending and target_records and total_records >= target_records:
+                    self.log(f"Collected {total_records} records, skipping {len(pending)} remaining website(s)")
+                    break
+                if pending and deadline is not None and time.monotonic() >= deadline:
+                    self.log(f"Time budget of {time_budget}s used up, skipping {len(pending)} remaining website(s)")
+                    break
+        finally:
+            # Queued sites are cancelled; ones already running are told to stop and
+            # finish in the background
+            if pending:
+                cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Tear down the run's state only after its abandoned workers have returned
+        self._abandoned = [future for future in self._abandoned if not future.done()] + list(pending)
+        self._when_done(pending, lambda: self._finish_run(prefetched))
+        # One concat at the end instead of building a frame from every row dict
+        return pd.concat(frames, ignore_index=True, copy=False) if frames else pd.DataFrame()
+    
+    def smart_scrape_multiple_websites(self, search_query, selected_categories=None, max_websites=15, skip_urls=None,
+                                       time_budget=None, target_records=None):
+        """Scrape multiple websites intelligently based on search query and categories"""
+        # Filter by categories, sort by priority (one entry per URL) and limit number
+        filtered_websites = _websites_for_categories(frozenset(selected_categories or ()))
+        websites_to_scrape = list(filtered_websites[:max_websites])
+        
+        # Leave out sites whose results the caller already has
+        if skip_urls:
+            skipped = [w for w in websites_to_scrape if w.url in skip_urls]
+            if skipped:
+                self.log(f"Skipping {len(skipped)} website(s) already scraped this session")
+            websites_to_scrape = [w for w in websites_to_scrape if w.url not in skip_urls]
         
-        self.log(f"Multi-website scraping complete. Total records: {len(all_data)}")
+        self.log(f"Starting multi-website scrape: {len(websites_to_scrape)} websites")
         
-        if all_data:
-            df = pd.DataFrame(all_data)
-            # Clean up the data
-            df = df.drop_duplicates()
-            return df
+        # Show website list
+        website_names = [w.name for w in websites_to_scrape]
+        self.log(f"Websites to scrape: {', '.join(website_names[:5])}..." if len(website_names) > 5 else f"Websites to scrape: {', '.join(website_names)}")
+        
+        df = self.scrape_all_websites(websites_to_scrape, search_query, time_budget, target_records)
+        
+        self.log(f"Multi-website scraping complete. Total records: {len(df)}")
+        
+        if not df.empty:
+            # Records are deduplicated per site as they are collected; every record carries
+            # its site's Source_URL, so no duplicates can span sites
+            return categorize_columns(df)
         return None
 
-def create_download_link(df, filename, file_type="csv"):
-    """Create download link for DataFrame"""
+# Columns whose values repeat across records (site names, content types, dates)
+CATEGORICAL_COLUMNS = (
+    'Source_Website', 'Source_URL', 'Scrape_Method', 'Content_Type', 'Data_Type',
+    'Category', 'Pattern_Type', 'Parser', 'PDF_URL', 'Scrape_Date'
+)
+
+def categorize_columns(df):
+    """Store repetitive string columns as pandas categoricals to save memory"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+    return df
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_smart_scrape(search_query, selected_categories, max_websites, max_workers, use_selenium, skip_urls,
+                        time_budget=None, target_records=None):
+    """Run a multi-website scrape, reusing the result for identical inputs for an hour"""
+    scraper = NigerianStatsScraper(
+        max_workers=max_workers,
+        use_selenium=use_selenium,
+        logger=logger
+    )
+    try:
+        scraped_data = scraper.smart_scrape_multiple_websites(
+            search_query,
+            list(selected_categories),
+            max_websites,
+            skip_urls=set(skip_urls),
+            time_budget=time_budget,
+            target_records=target_records
+        )
+    finally:
+        # Close Selenium if used
+        scraper.close_selenium()
+    return scraped_data, tuple(scraper.scraped_urls)
+
+# Anything other than letters, digits, underscores and hyphens is unsafe in a file name
+_FILENAME_UNSAFE_RE = re.compile(r'[^\w-]+')
+
+def export_basename(query, timestamp):
+    """File name (without extension) for exporting the results of a search query"""
+    return f"nigeria_stats_{_FILENAME_UNSAFE_RE.sub('_', query)[:64]}_{timestamp}"
+
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+    "feather": "application/vnd.apache.arrow.file"
+}
+
+EXPORT_EXTENSIONS = {"csv": "csv", "json": "json", "excel": "xlsx", "parquet": "parquet", "feather": "feather"}
+
+# Columnar formats need pyarrow
+EXPORT_FORMATS = ["CSV", "JSON", "Excel"] + (["Parquet", "Feather"] if PYARROW_AVAILABLE else [])
+
+def dataframe_fingerprint(df):
+    """Cheap hash key for a DataFrame: shape, columns and a hash of its first and last 500 rows"""
+    return (
+        df.shape,
+        tuple(df.columns),
+        int(pd.util.hash_pandas_object(df.head(500), index=False).sum())
+        ^ int(pd.util.hash_pandas_object(df.tail(500), index=False).sum())
+    )
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_fingerprint}, show_spinner=False, max_entries=16)
+def dataframe_to_bytes(df, file_type="csv"):
+    """Serialize a DataFrame in memory for st.download_button"""
     if file_type == "csv":
-        csv = df.to_csv(index=False)
-        b64 = base64.b64encode(csv.encode()).decode()
-        href = f'<a href="data:file/csv;base64,{b64}" download="{filename}" target="_blank">📥 Download {filename}</a>'
-        return href
+        buffer = io.BytesIO()
+        if PYARROW_AVAILABLE:
+            try:
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+                return buffer.getvalue()
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # Columns mixing numbers and strings can't be converted to Arrow
+                buffer = io.BytesIO()
+        df.to_csv(buffer, index=False)
+        return buffer.getvalue()
     elif file_type == "json":
-        json_str = df.to_json(orient='records', indent=2)
-        b64 = base64.b64encode(json_str.encode()).decode()
-        href = f'<a href="data:application/json;base64,{b64}" download="{filename}" target="_blank">📥 Download {filename}</a>'
-        return href
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                df.to_dict(orient='records'),
+                default=str,
+                # Tables without a header row have integer column labels
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        return df.to_json(orient='records', indent=2).encode('utf-8')
+    elif file_type == "excel":
+        buffer = io.BytesIO()
+        if XLSXWRITER_AVAILABLE:
+            _write_xlsx_rows(df, buffer)
+        else:
+            df.to_excel(buffer, index=False)
+        return buffer.getvalue()
+    elif file_type in ("parquet", "feather"):
+        buffer = io.BytesIO()
+        df = df.reset_index(drop=True)
+        try:
+            _write_arrow(df, buffer, file_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columns mixing numbers and strings are exported as text
+            buffer = io.BytesIO()
+            object_cols = df.select_dtypes(include='object').columns
+            _write_arrow(df.astype({col: 'string' for col in object_cols}), buffer, file_type)
+        return buffer.getvalue()
+
+def _write_arrow(df, output, file_type):
+    """Write a DataFrame as zstd-compressed Parquet or Feather"""
+    if file_type == "parquet":
+        df.to_parquet(output, engine='pyarrow', compression='zstd', index=False)
+    else:
+        df.to_feather(output, compression='zstd')
+
+def _excel_cell(value):
+    """Convert a DataFrame value into something xlsxwriter can write"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+def _write_xlsx_rows(df, output):
+    """Write a DataFrame to XLSX row by row in xlsxwriter's constant_memory mode"""
+    # pandas' to_excel writes column by column, which constant_memory mode cannot
+    # handle, so rows are written directly and flushed as they are completed
+    # Scraped text is written as-is, without URL and formula detection on every cell
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False
+    })
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, [str(column) for column in df.columns])
+    for row_number, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_number, 0, [_excel_cell(value) for value in row])
+    workbook.close()
+
+def download_button(df, filename, file_type="csv", label=None, **kwargs):
+    """Show a download button for a DataFrame"""
+    return st.download_button(
+        label=label or f"📥 Download {filename}",
+        data=dataframe_to_bytes(df, file_type),
+        file_name=filename,
+        mime=EXPORT_MIME_TYPES[file_type],
+        **kwargs
+    )
+
+# Scraped records appended across sessions
+DATABASE_PATH = os.path.join("scraped_data", "nigeria_stats.db")
+
+# The connection is shared by every session, so writes are serialized
+_DATABASE_LOCK = threading.Lock()
+
+@st.cache_resource
+def get_database(db_path=DATABASE_PATH):
+    """Open the SQLite results database once per server, in WAL mode"""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+# SQLite matches identifiers case-insensitively, but only for ASCII letters
+_SQLITE_CASE_FOLD = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def _quote_identifier(name):
+    """Quote a table or column name for SQLite, escaping embedded double quotes"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def save_to_database(df, table="nigeria_stats"):
+    """Append a DataFrame to the results database, adding any columns the table lacks"""
+    # Scraped headers such as 'Value' and 'value' are the same SQLite column; later ones
+    # get a numeric suffix
+    names, seen = [], set()
+    for col in map(str, df.columns):
+        name, suffix = col, 2
+        while name.translate(_SQLITE_CASE_FOLD) in seen:
+            name, suffix = f"{col}_{suffix}", suffix + 1
+        seen.add(name.translate(_SQLITE_CASE_FOLD))
+        names.append(name)
+    df = df.set_axis(names, axis=1)
+    # Scraped values can be dicts or lists, which SQLite cannot store
+    object_cols = df.select_dtypes(include='object').columns
+    df = df.astype({col: 'string' for col in object_cols})
+    conn = get_database()
+    with _DATABASE_LOCK:
+        try:
+            existing = {row[1].translate(_SQLITE_CASE_FOLD) for row in conn.execute(f'PRAGMA table_info({_quote_identifier(table)})')}
+            if existing:
+                for col in df.columns:
+                    if col.translate(_SQLITE_CASE_FOLD) not in existing:
+                        conn.execute(f'ALTER TABLE {_quote_identifier(table)} ADD COLUMN {_quote_identifier(col)}')
+            df.to_sql(table, conn, if_exists="append", index=False, chunksize=1000)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return len(df)
+
+@st.cache_resource
+def ensure_directories():
+    """Create the app's working directories once per server process"""
+    for path in ("static", "scraped_data"):
+        os.makedirs(path, exist_ok=True)
+
+# Static page footer, rendered after the app on every run
+FOOTER_HTML = """
+    <div style="text-align: center; color: #666; padding: 2rem 0;">
+        <p><strong>Nigeria Statistics Web Scraper</strong> • Version 3.0</p>
+        <p>🌐 <strong>Multi-website scraping</strong> with Google Drive integration</p>
+        <p>☁️ <strong>Google Drive:</strong> Save files directly to your cloud storage</p>
+        <p>⚡ <strong>Concurrent scraping</strong> with thread-safe logging</p>
+        <p>⚠️ <strong>Note:</strong> Respect website terms of service. Use responsibly.</p>
+        <p>🛠️ <strong>Technologies:</strong> Python, BeautifulSoup, Google Drive API, Streamlit</p>
+    </div>
+"""
 
 def main():
     """Main application function"""
@@ -1115,6 +2156,8 @@ def main():
         st.session_state.google_drive_auth = None
     if 'google_drive_folder_id' not in st.session_state:
         st.session_state.google_drive_folder_id = None
+    if 'scraped_urls' not in st.session_state:
+        st.session_state.scraped_urls = set()
     
     # Header
     st.markdown('<h1 class="main-header">🌐 Nigeria Statistics Web Scraper Pro</h1>', unsafe_allow_html=True)
@@ -1166,6 +2209,9 @@ def main():
         max_websites = st.slider("Maximum websites to scrape", 1, 20, 8)
         max_workers = st.slider("Concurrent scrapers", 1, 5, 3)
         timeout = st.slider("Timeout per website (seconds)", 10, 60, 30)
+        force_refresh = st.checkbox("Re-scrape websites already scraped this session", value=False)
+        time_budget = st.number_input("Stop scraping after (seconds, 0 = no limit)", 0, 600, 0, step=10)
+        target_records = st.number_input("Stop once this many records are found (0 = no limit)", 0, 100000, 0, step=100)
         
         if SELENIUM_AVAILABLE:
             use_selenium = st.checkbox("Use Selenium for JavaScript sites", value=False)
@@ -1212,7 +2258,7 @@ def main():
         st.subheader("💾 Export Options")
         export_format = st.selectbox(
             "Export format:",
-            ["CSV", "JSON", "Excel"]
+            EXPORT_FORMATS
         )
         
         auto_download = st.checkbox("Auto-download after scraping", value=True)
@@ -1267,14 +2313,17 @@ def main():
     # Show all sources if requested
     if st.session_state.get('show_sources', False):
         st.subheader("📚 Complete List of Data Sources")
-        scraper = NigerianStatsScraper(logger=logger)
-        websites = scraper.get_nigerian_statistical_websites()
-        
-        for website in websites:
-            with st.expander(f"{website['name']} - {website['category']}"):
-                st.write(f"**URL:** {website['url']}")
-                st.write(f"**Method:** {website['scrape_method']}")
-                st.write(f"**Priority:** {website['priority']}")
+        websites = NIGERIAN_STATISTICAL_WEBSITES
+        
+        # One table by default; the per-site expanders are opt-in
+        if st.checkbox("Detailed view", value=False, key="sources_detailed"):
+            for website in websites:
+                with st.expander(f"{website.name} - {website.category}"):
+                    st.write(f"**URL:** {website.url}")
+                    st.write(f"**Method:** {website.scrape_method}")
+                    st.write(f"**Priority:** {website.priority}")
+        else:
+            st.dataframe(pd.DataFrame(websites), use_container_width=True, hide_index=True)
     
     # Scrape button
     col1, col2 = st.columns([3, 1])
@@ -1290,13 +2339,6 @@ def main():
                 st.session_state.scraping_log = []  # Clear previous log
                 
                 with st.spinner(f"🌐 Scraping {max_websites} websites for '{query}'..."):
-                    # Initialize scraper with thread-safe logger
-                    scraper = NigerianStatsScraper(
-                        max_workers=max_workers,
-                        use_selenium=use_selenium,
-                        logger=logger
-                    )
-                    
                     # Show scraping progress
                     progress_bar = st.progress(0)
                     status_text = st.empty()
@@ -1309,36 +2351,57 @@ def main():
                     status_text.text("Scraping multiple websites...")
                     progress_bar.progress(30)
                     
-                    scraped_data = scraper.smart_scrape_multiple_websites(
+                    # Websites already scraped for this query keep their current results
+                    previous_data = st.session_state.scraped_data
+                    skip_urls = set()
+                    if (not force_refresh and previous_data is not None
+                            and st.session_state.get('scraped_query') == query
+                            and 'Source_URL' in previous_data.columns):
+                        skip_urls = st.session_state.scraped_urls
+                    
+                    if force_refresh:
+                        cached_smart_scrape.clear()
+                    
+                    scraped_data, scraped_urls = cached_smart_scrape(
                         query, 
-                        selected_categories, 
-                        max_websites
+                        tuple(selected_categories), 
+                        max_websites,
+                        max_workers,
+                        use_selenium,
+                        frozenset(skip_urls),
+                        time_budget or None,
+                        target_records or None
                     )
                     
+                    if skip_urls:
+                        carried_data = previous_data[previous_data['Source_URL'].isin(skip_urls)]
+                        if scraped_data is None:
+                            scraped_data = carried_data
+                        else:
+                            scraped_data = categorize_columns(pd.concat([carried_data, scraped_data], ignore_index=True))
+                    
                     # Update progress
                     progress_bar.progress(90)
                     status_text.text("Processing results...")
                     
-                    # Close Selenium if used
-                    scraper.close_selenium()
-                    
                     if scraped_data is not None and not scraped_data.empty:
                         st.session_state.scraped_data = scraped_data
+                        st.session_state.scraped_query = query
+                        st.session_state.scraped_urls = set(skip_urls) | set(scraped_urls)
                         
                         status_text.text("✅ Multi-website scraping completed!")
                         progress_bar.progress(100)
                         
                         st.success(f"🎉 Successfully scraped {len(scraped_data)} records!")
+                        st.session_state.export_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                        filename = export_basename(query, st.session_state.export_timestamp)
                         
                         # Save to Google Drive if enabled
                         if GOOGLE_DRIVE_AVAILABLE and st.session_state.get('google_drive_auth') and st.session_state.get('google_drive_folder_id'):
                             with st.spinner("📤 Uploading to Google Drive..."):
-                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                file_name = f"nigeria_stats_{query.replace(' ', '_')}_{timestamp}"
-                                
                                 result = st.session_state.google_drive_auth.upload_dataframe(
                                     scraped_data,
-                                    file_name,
+                                    filename,
                                     st.session_state.google_drive_folder_id,
                                     export_format.lower()
                                 )
@@ -1350,29 +2413,13 @@ def main():
                         
                         # Auto-download if enabled
                         if auto_download:
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            filename = f"nigeria_stats_{query.replace(' ', '_')}_{timestamp}"
-                            
-                            if export_format == "CSV":
-                                csv_link = create_download_link(scraped_data, f"{filename}.csv", "csv")
-                                st.markdown(csv_link, unsafe_allow_html=True)
-                            
-                            elif export_format == "JSON":
-                                json_link = create_download_link(scraped_data, f"{filename}.json", "json")
-                                st.markdown(json_link, unsafe_allow_html=True)
-                            
-                            elif export_format == "Excel":
-                                os.makedirs("scraped_data", exist_ok=True)
-                                excel_path = f"scraped_data/{filename}.xlsx"
-                                scraped_data.to_excel(excel_path, index=False)
-                                with open(excel_path, "rb") as f:
-                                    excel_bytes = f.read()
-                                st.download_button(
-                                    label="📥 Download Excel",
-                                    data=excel_bytes,
-                                    file_name=f"{filename}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                )
+                            file_type = export_format.lower()
+                            download_button(
+                                scraped_data,
+                                f"{filename}.{EXPORT_EXTENSIONS[file_type]}",
+                                file_type,
+                                label="📥 Download Excel" if file_type == "excel" else None
+                            )
                     else:
                         st.warning("⚠️ No data found from the selected websites.")
                         st.info("💡 Try different search terms or select different categories.")
@@ -1383,6 +2430,7 @@ def main():
         if st.button("🔄 Clear Results", use_container_width=True, key="clear_button"):
             st.session_state.scraped_data = None
             st.session_state.scraping_log = []
+            st.session_state.scraped_urls = set()
             st.success("Results cleared!")
             st.rerun()
     
@@ -1412,6 +2460,10 @@ def main():
         
         df = st.session_state.scraped_data
         
+        # Default file names use the time of the scrape, so reruns don't keep changing them
+        now_str = st.session_state.get('export_timestamp') or datetime.now().strftime('%Y%m%d_%H%M%S')
+        month_str = now_str[:6]
+        
         # Show statistics
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1437,7 +2489,7 @@ def main():
             
             with filter_col1:
                 if 'Source_Website' in df.columns:
-                    sources = df['Source_Website'].unique()
+                    sources = list(df['Source_Website'].dropna().unique())
                     selected_sources = st.multiselect(
                         "Filter by website:",
                         sources,
@@ -1446,7 +2498,7 @@ def main():
             
             with filter_col2:
                 if 'Category' in df.columns:
-                    categories = df['Category'].unique()
+                    categories = list(df['Category'].dropna().unique())
                     selected_cats = st.multiselect(
                         "Filter by category:",
                         categories,
@@ -1495,7 +2547,7 @@ def main():
                     # File name input
                     drive_filename = st.text_input(
                         "File name for Google Drive:",
-                        value=f"nigeria_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                        value=f"nigeria_stats_{now_str}",
                         key="drive_filename"
                     )
                     
@@ -1509,7 +2561,7 @@ def main():
                     # Folder selection
                     folder_name = st.text_input(
                         "Folder name (optional, creates if doesn't exist):",
-                        value=f"Nigeria_Stats_{datetime.now().strftime('%Y%m')}",
+                        value=f"Nigeria_Stats_{month_str}",
                         key="drive_folder"
                     )
                     
@@ -1559,59 +2611,49 @@ def main():
         
         export_filename = st.text_input(
             "Export filename:",
-            value=f"nigeria_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            value=f"nigeria_stats_{now_str}",
             key="export_filename"
         )
         
-        col1, col2, col3, col4 = st.columns(4)
+        export_choice = st.radio("Format:", EXPORT_FORMATS, horizontal=True, key="export_type")
+        export_type = export_choice.lower()
+        
+        col1, col2, col3 = st.columns(3)
         
         with col1:
-            if st.button("📥 Download CSV", use_container_width=True, key="export_csv"):
-                csv_link = create_download_link(df, f"{export_filename}.csv", "csv")
-                st.markdown(csv_link, unsafe_allow_html=True)
+            # Only the chosen format is serialized, and the bytes are cached per DataFrame
+            download_button(
+                df,
+                f"{export_filename}.{EXPORT_EXTENSIONS[export_type]}",
+                export_type,
+                label=f"📥 Download {export_choice}",
+                use_container_width=True,
+                key="export_download"
+            )
         
         with col2:
-            if st.button("📥 Download JSON", use_container_width=True, key="export_json"):
-                json_link = create_download_link(df, f"{export_filename}.json", "json")
-                st.markdown(json_link, unsafe_allow_html=True)
-        
-        with col3:
-            if st.button("📥 Download Excel", use_container_width=True, key="export_excel"):
-                os.makedirs("scraped_data", exist_ok=True)
-                excel_path = f"scraped_data/{export_filename}.xlsx"
-                df.to_excel(excel_path, index=False)
-                with open(excel_path, "rb") as f:
-                    excel_bytes = f.read()
-                st.download_button(
-                    label="Download Excel",
-                    data=excel_bytes,
-                    file_name=f"{export_filename}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
-        
-        with col4:
             if st.button("💾 Save Locally", use_container_width=True, key="save_local"):
-                os.makedirs("scraped_data", exist_ok=True)
-                filepath = f"scraped_data/{export_filename}.csv"
-                df.to_csv(filepath, index=False)
+                filepath = f"scraped_data/{_FILENAME_UNSAFE_RE.sub('_', export_filename)}.csv"
+                # Reuses the cached CSV bytes the download button serves
+                with open(filepath, 'wb') as f:
+                    f.write(dataframe_to_bytes(df, "csv"))
                 st.success(f"✅ Data saved to: {filepath}")
-
-# Footer
-st.markdown("---")
-st.markdown("""
-    <div style="text-align: center; color: #666; padding: 2rem 0;">
-        <p><strong>Nigeria Statistics Web Scraper</strong> • Version 3.0</p>
-        <p>🌐 <strong>Multi-website scraping</strong> with Google Drive integration</p>
-        <p>☁️ <strong>Google Drive:</strong> Save files directly to your cloud storage</p>
-        <p>⚡ <strong>Concurrent scraping</strong> with thread-safe logging</p>
-        <p>⚠️ <strong>Note:</strong> Respect website terms of service. Use responsibly.</p>
-        <p>🛠️ <strong>Technologies:</strong> Python, BeautifulSoup, Google Drive API, Streamlit</p>
-    </div>
-""", unsafe_allow_html=True)
+        
+        with col3:
+            if st.button("🗄️ Save to Database", use_container_width=True, key="save_database"):
+                try:
+                    rows = save_to_database(df)
+                    st.success(f"✅ {rows} records added to: {DATABASE_PATH}")
+                except Exception as e:
+                    st.error(f"❌ Error saving to database: {str(e)}")
 
 if __name__ == "__main__":
+    _init_ui()
+    
+    # Footer
+    st.markdown("---")
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+    
     # Create necessary directories
-    os.makedirs("static", exist_ok=True)
-    os.makedirs("scraped_data", exist_ok=True)
+    ensure_directories()
     main()
\ No newline at end of file
@@ -1,21 +1,23 @@
 import streamlit as st
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+import logging
 import time
 from datetime import datetime
 import json
-import base64
 import os
 from urllib.parse import urljoin, urlparse
 import numpy as np
 import concurrent.futures
 import io
 import threading
-from queue import Queue
+from collections import deque
 import pickle
 import socket
+import functools
+import itertools
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 import html5lib
@@ -57,6 +59,11 @@ except ImportError as e:
     print(f"Some PDF libraries not available: {e}")
     PDF_LIBRARIES_AVAILABLE = False
 
+# pdfminer (also used by pdfplumber) logs every token it parses; keep only errors
+for _logger_name in ("pdfminer", "pdfplumber"):
+    logging.getLogger(_logger_name).setLevel(logging.ERROR)
+    logging.getLogger(_logger_name).propagate = False
+
 # Google Drive API libraries
 GOOGLE_DRIVE_AVAILABLE = False
 try:
@@ -71,6 +78,13 @@ except ImportError as e:
     print(f"Google Drive libraries not available: {e}")
     GOOGLE_DRIVE_AVAILABLE = False
 
+# Faster Excel writer (optional, pandas falls back to openpyxl)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 # Page configuration
 st.set_page_config(
     page_title="Nigeria Data Table Scraper",
@@ -135,25 +149,33 @@ st.markdown("""
 
 # Thread-safe logging queue
 class ThreadSafeLogger:
-    def __init__(self):
-        self.log_queue = Queue()
-        self.logs = []
+    def __init__(self, maxlen=10000, verbose=True):
+        # A bounded buffer keeps long scrapes from growing memory without limit
+        self.logs = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._logged = 0  # total messages ever added
+        self._read = 0    # messages already returned by get_logs
+        self.verbose = verbose
     
     def add_log(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_message = f"[{timestamp}] {message}"
-        self.log_queue.put(log_message)
-        self.logs.append(log_message)
-        print(log_message)
+        with self._lock:
+            self.logs.append(log_message)
+            self._logged += 1
+        if self.verbose:
+            print(log_message)
     
     def get_logs(self):
-        logs = []
-        while not self.log_queue.empty():
-            logs.append(self.log_queue.get())
-        return logs
+        # Get logs added since the last call
+        with self._lock:
+            unread = min(self._logged - self._read, len(self.logs))
+            self._read = self._logged
+            return list(itertools.islice(self.logs, len(self.logs) - unread, None))
     
     def get_all_logs(self):
-        return self.logs
+        with self._lock:
+            return list(self.logs)
 
 logger = ThreadSafeLogger()
 
@@ -296,6 +318,38 @@ NIGERIAN_TOPICS = {
     }
 }
 
+# The table pass only needs the page's tables; the text pass parses the whole page
+_TABLE_STRAINER = SoupStrainer('table')
+
+# Number patterns that usually mark a statistic in page text
+_TEXT_STAT_PATTERNS = [
+    re.compile(r'\b\d+\.?\d*\s*%\b'),  # Percentages
+    re.compile(r'\b\d{1,3}(?:,\d{3})+\b'),  # Large numbers
+    re.compile(r'\b\d+\s*(?:million|billion|thousand)\b'),  # Quantities
+]
+
+@functools.lru_cache(maxsize=64)
+def _search_terms_regex(search_terms):
+    """Compile search terms into one case-insensitive alternation, or None if there are none"""
+    if not search_terms:
+        return None
+    return re.compile('|'.join(re.escape(term) for term in search_terms), re.IGNORECASE)
+
+def _write_excel(df, path):
+    """Write a DataFrame to an XLSX file, returning the bytes so downloads don't re-read it"""
+    buffer = io.BytesIO()
+    if XLSXWRITER_AVAILABLE:
+        # Scraped text is written as-is, without URL and formula detection on every cell
+        options = {'strings_to_urls': False, 'strings_to_formulas': False}
+        with pd.ExcelWriter(buffer, engine='xlsxwriter', engine_kwargs={'options': options}) as writer:
+            df.to_excel(writer, index=False)
+    else:
+        df.to_excel(buffer, index=False)
+    data = buffer.getvalue()
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
 class TableScraper:
     """Specialized class for extracting and processing tables from websites"""
     
@@ -309,6 +363,7 @@ class TableScraper:
     def extract_all_tables(self, soup, url, search_terms):
         """Extract all tables from HTML content"""
         tables_data = []
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
         
         try:
             # Method 1: Use pandas read_html
@@ -317,7 +372,7 @@ class TableScraper:
                 for i, df in enumerate(df_list):
                     if not df.empty and len(df) > 1:
                         if self._table_matches_search(df, search_terms):
-                            table_info = self._process_table(df, i, url, "pandas")
+                            table_info = self._process_table(df, i, url, "pandas", scrape_date)
                             tables_data.append(table_info)
             except:
                 pass
@@ -326,7 +381,7 @@ class TableScraper:
             html_tables = soup.find_all('table')
             for table_idx, table in enumerate(html_tables):
                 try:
-                    table_data = self._extract_table_manually(table, table_idx, url)
+                    table_data = self._extract_table_manually(table, table_idx, url, scrape_date)
                     if table_data and self._table_matches_search(table_data['dataframe'], search_terms):
                         tables_data.append(table_data)
                 except:
@@ -337,7 +392,7 @@ class TableScraper:
         
         return tables_data
     
-    def _process_table(self, df, table_index, url, method):
+    def _process_table(self, df, table_index, url, method, scrape_date):
         """Process a pandas DataFrame table"""
         df = df.copy().dropna(how='all').reset_index(drop=True)
         
@@ -347,7 +402,7 @@ class TableScraper:
             'extraction_method': method,
             'rows': len(df),
             'columns': len(df.columns),
-            'scrape_date': datetime.now().strftime('%Y-%m-%d'),
+            'scrape_date': scrape_date,
             'column_names': list(df.columns)
         }
         
@@ -357,7 +412,7 @@ class TableScraper:
             'preview': df.head(5).to_dict('records')
         }
     
-    def _extract_table_manually(self, table, table_index, url):
+    def _extract_table_manually(self, table, table_index, url, scrape_date):
         """Manually extract table data"""
         try:
             rows = table.find_all('tr')
@@ -393,7 +448,7 @@ class TableScraper:
                 'extraction_method': 'manual',
                 'rows': len(df),
                 'columns': len(df.columns),
-                'scrape_date': datetime.now().strftime('%Y-%m-%d'),
+                'scrape_date': scrape_date,
                 'column_names': list(df.columns)
             }
             
@@ -411,20 +466,14 @@ class TableScraper:
         if not search_terms:
             return True
         
-        # Convert DataFrame to string for searching
-        df_str = df.to_string().lower()
+        search_re = _search_terms_regex(tuple(search_terms))
         
-        for term in search_terms:
-            if term.lower() in df_str:
-                return True
+        # Convert DataFrame to string for searching
+        if search_re.search(df.to_string()):
+            return True
         
         # Check column names
-        columns_str = ' '.join(df.columns.astype(str)).lower()
-        for term in search_terms:
-            if term.lower() in columns_str:
-                return True
-        
-        return False
+        return bool(search_re.search(' '.join(df.columns.astype(str))))
     
     def save_table(self, table_data, filename_prefix, folder="tables"):
         """Save table to CSV and Excel files"""
@@ -440,7 +489,7 @@ class TableScraper:
             
             # Save as Excel
             excel_path = os.path.join(folder, f"{filename_prefix}_{table_name}.xlsx")
-            df.to_excel(excel_path, index=False)
+            excel_bytes = _write_excel(df, excel_path)
             
             # Save metadata
             meta_path = os.path.join(folder, f"{filename_prefix}_{table_name}_metadata.json")
@@ -450,6 +499,7 @@ class TableScraper:
             return {
                 'csv_path': csv_path,
                 'excel_path': excel_path,
+                'excel_bytes': excel_bytes,
                 'metadata_path': meta_path,
                 'table_name': table_name,
                 'rows': len(df),
@@ -469,6 +519,15 @@ class NigerianDataScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         })
+        
+        # Keep connections to each source host alive between requests and retry transient server errors
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers * 4,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.max_workers = max_workers
         self.logger = logger
         self.table_scraper = TableScraper(logger=logger)
@@ -558,17 +617,17 @@ class NigerianDataScraper:
                     self.log(f"    ⚠️ Connection failed for {source['name']}")
                     continue
                 
-                # Parse the page
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract tables
+                # Extract tables, parsing only the page's tables
+                soup = BeautifulSoup(response.content, 'lxml', parse_only=_TABLE_STRAINER)
                 tables = self.table_scraper.extract_all_tables(soup, source['url'], search_terms)
                 
                 if tables:
                     self.log(f"    ✅ Found {len(tables)} tables")
                     all_tables.extend(tables)
                     
-                    # Also extract text data
+                    # Also extract text data; a strained tree would drop div/span text and the
+                    # whitespace between elements, gluing neighbouring numbers together
+                    soup = BeautifulSoup(response.content, 'lxml')
                     text_data = self.extract_text_data(soup, source['url'], search_terms)
                     all_data.extend(text_data)
                 else:
@@ -583,33 +642,29 @@ class NigerianDataScraper:
         """Extract relevant text data"""
         data = []
         text = soup.get_text()
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
         
-        # Look for patterns with numbers (likely statistics)
-        patterns = [
-            r'\b\d+\.?\d*\s*%\b',  # Percentages
-            r'\b\d{1,3}(?:,\d{3})+\b',  # Large numbers
-            r'\b\d+\s*(?:million|billion|thousand)\b',  # Quantities
-        ]
+        # Relevance only depends on the page text, so check the search terms once
+        search_re = _search_terms_regex(tuple(search_terms))
+        if search_re is None or not search_re.search(text):
+            return data
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches[:10]:  # Limit matches
-                # Check if match is relevant to search terms
-                for term in search_terms:
-                    if term.lower() in text.lower():
-                        data.append({
-                            'value': match,
-                            'context': self.get_context(text, match),
-                            'source_url': url,
-                            'scrape_date': datetime.now().strftime('%Y-%m-%d')
-                        })
-                        break
+        # Look for patterns with numbers (likely statistics), stopping after 10 of each
+        for pattern in _TEXT_STAT_PATTERNS:
+            for match in itertools.islice(pattern.finditer(text), 10):
+                data.append({
+                    'value': match.group(),
+                    'context': self.get_context(text, match.group(), match.start()),
+                    'source_url': url,
+                    'scrape_date': scrape_date
+                })
         
         return data
     
-    def get_context(self, text, match, chars=100):
+    def get_context(self, text, match, idx=None, chars=100):
         """Get context around a match"""
-        idx = text.find(match)
+        if idx is None:
+            idx = text.find(match)
         if idx == -1:
             return match
         
@@ -638,10 +693,10 @@ class NigerianDataScraper:
             text_csv = os.path.join(topic_folder, f"{topic}_text_data.csv")
             text_excel = os.path.join(topic_folder, f"{topic}_text_data.xlsx")
             text_df.to_csv(text_csv, index=False)
-            text_df.to_excel(text_excel, index=False)
             saved_files.append({
                 'csv_path': text_csv,
                 'excel_path': text_excel,
+                'excel_bytes': _write_excel(text_df, text_excel),
                 'type': 'text_data'
             })
         
@@ -919,13 +974,11 @@ def main():
                                     key=f"csv_{saved_file['csv_path']}"
                                 )
                                 
-                                # Excel download if available
-                                if 'excel_path' in saved_file and os.path.exists(saved_file['excel_path']):
-                                    with open(saved_file['excel_path'], 'rb') as f:
-                                        excel_bytes = f.read()
+                                # Excel download, reusing the bytes kept when the file was saved
+                                if 'excel_bytes' in saved_file:
                                     st.download_button(
                                         label="📥 Excel",
-                                        data=excel_bytes,
+                                        data=saved_file['excel_bytes'],
                                         file_name=os.path.basename(saved_file['excel_path']),
                                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                         key=f"excel_{saved_file['excel_path']}"
@@ -1004,7 +1057,12 @@ def main():
                 - Labor force statistics
             """)
 
+@st.cache_resource
+def ensure_directories():
+    """Create the app's data directory once per server process"""
+    os.makedirs("data", exist_ok=True)
+
 if __name__ == "__main__":
     # Create data directory
-    os.makedirs("data", exist_ok=True)
+    ensure_directories()
     main()
\ No newline at end of file
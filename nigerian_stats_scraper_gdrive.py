@@ -1,16 +1,17 @@
 import streamlit as st
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 import time
 from datetime import datetime
 import json
-import base64
 import os
 import io
+import concurrent.futures
 from urllib.parse import urljoin, urlparse
-import numpy as np
 
 # Google Drive imports
 from google.oauth2.credentials import Credentials
@@ -20,6 +21,21 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 import pickle
 
+# Faster JSON export (optional, falls back to pandas' to_json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Multi-threaded C++ CSV writer and Parquet export (optional)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Page configuration
 st.set_page_config(
     page_title="Nigeria Stats Web Scraper",
@@ -155,15 +171,19 @@ class GoogleDriveManager:
     
     def upload_csv_to_drive(self, dataframe, filename, folder_id=None, description=""):
         """Upload a pandas DataFrame as CSV to Google Drive"""
+        return self.upload_dataframe_to_drive(dataframe, filename, "csv", folder_id, description)
+    
+    def upload_dataframe_to_drive(self, dataframe, filename, file_type="csv", folder_id=None, description=""):
+        """Upload a pandas DataFrame to Google Drive in one of the EXPORT_MIME_TYPES formats"""
         try:
-            # Convert DataFrame to CSV string
-            csv_data = dataframe.to_csv(index=False)
+            # Same cached bytes the download button serves
+            data = dataframe_to_bytes(dataframe, file_type)
             
             # Create file metadata
             file_metadata = {
                 'name': filename,
                 'description': description,
-                'mimeType': 'text/csv'
+                'mimeType': EXPORT_MIME_TYPES[file_type]
             }
             
             if folder_id:
@@ -171,8 +191,8 @@ class GoogleDriveManager:
             
             # Create media upload
             media = MediaIoBaseUpload(
-                io.BytesIO(csv_data.encode('utf-8')),
-                mimetype='text/csv',
+                io.BytesIO(data),
+                mimetype=EXPORT_MIME_TYPES[file_type],
                 resumable=True
             )
             
@@ -230,8 +250,10 @@ class GoogleDriveManager:
 class NigerianStatsScraper:
     """Actual web scraper for Nigerian statistical data"""
     
-    def __init__(self):
+    def __init__(self, log=None):
         self.base_url = "https://www.nigerianstat.gov.ng"
+        # Where progress messages go; defaults to the session's scraping log
+        self.log = log or log_entry
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -239,35 +261,45 @@ class NigerianStatsScraper:
             'Accept-Language': 'en-US,en;q=0.5',
             'Connection': 'keep-alive',
         })
+        
+        # Reuse connections to the NBS/NPC/CBN hosts and retry transient server errors
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.timeout = 30
         
     def scrape_nbs_website(self, search_query=None):
         """Scrape data from Nigerian Statistics Bureau website"""
         try:
-            log_entry("Starting NBS website scrape...")
+            self.log("Starting NBS website scrape...")
             
             # Try to access the main page
             main_url = "https://www.nigerianstat.gov.ng"
             response = self.session.get(main_url, timeout=self.timeout)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # extract_nbs_data only reads tables, so skip building the rest of the tree
+                soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('table'))
                 
                 # Look for data sections
                 data = self.extract_nbs_data(soup, search_query)
                 
                 if data:
-                    log_entry(f"Found {len(data)} data points from NBS website")
+                    self.log(f"Found {len(data)} data points from NBS website")
                     return pd.DataFrame(data)
                 else:
                     # Try library section
                     return self.scrape_nbs_library(search_query)
             else:
-                log_entry(f"Failed to access NBS website. Status: {response.status_code}")
+                self.log(f"Failed to access NBS website. Status: {response.status_code}")
                 return None
                 
         except Exception as e:
-            log_entry(f"Error scraping NBS website: {str(e)}")
+            self.log(f"Error scraping NBS website: {str(e)}")
             return None
     
     def scrape_nbs_library(self, search_query=None):
@@ -277,8 +309,9 @@ class NigerianStatsScraper:
             response = self.session.get(library_url, timeout=self.timeout)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('a', href=True))
                 data = []
+                scrape_date = datetime.now().strftime('%Y-%m-%d')
                 
                 # Look for publications and reports
                 links = soup.find_all('a', href=True)
@@ -293,19 +326,20 @@ class NigerianStatsScraper:
                             'URL': urljoin(library_url, href),
                             'Type': 'Report/Publication',
                             'Source': 'NBS eLibrary',
-                            'Scrape_Date': datetime.now().strftime('%Y-%m-%d'),
+                            'Scrape_Date': scrape_date,
                             'Search_Query': search_query or 'General'
                         })
                 
                 return pd.DataFrame(data) if data else None
                 
         except Exception as e:
-            log_entry(f"Error scraping NBS library: {str(e)}")
+            self.log(f"Error scraping NBS library: {str(e)}")
             return None
     
     def extract_nbs_data(self, soup, search_query=None):
         """Extract data from NBS website"""
         data = []
+        scrape_date = datetime.now().strftime('%Y-%m-%d')
         
         # Look for tables with statistical data
         tables = soup.find_all('table')
@@ -317,7 +351,7 @@ class NigerianStatsScraper:
                 for df in dfs:
                     # Add metadata
                     df['Source'] = 'NBS Website Table'
-                    df['Scrape_Date'] = datetime.now().strftime('%Y-%m-%d')
+                    df['Scrape_Date'] = scrape_date
                     df['Search_Query'] = search_query or 'General'
                     
                     # Convert to list of dictionaries
@@ -334,7 +368,7 @@ class NigerianStatsScraper:
                             data.append({
                                 'Table_Row': ' | '.join(row_data),
                                 'Source': 'NBS Website',
-                                'Scrape_Date': datetime.now().strftime('%Y-%m-%d'),
+                                'Scrape_Date': scrape_date,
                                 'Search_Query': search_query or 'General'
                             })
                 except:
@@ -399,24 +433,96 @@ class NigerianStatsScraper:
         except:
             return None
 
+# Characters stripped from search queries before they go into file names
+_UNSAFE_QUERY_RE = re.compile(r'[^\w\s-]')
+
 def log_entry(message):
     """Add message to scraping log"""
     timestamp = datetime.now().strftime("%H:%M:%S")
     log_message = f"[{timestamp}] {message}"
     st.session_state.scraping_log.append(log_message)
 
-def create_download_link(df, filename, file_type="csv"):
-    """Create download link for DataFrame"""
+class NBSScrapeFailed(Exception):
+    """Raised by cached_nbs_scrape so a failed scrape isn't cached; args[0] holds the log lines"""
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
+def cached_nbs_scrape(search_query):
+    """Scrape the NBS website, reusing a successful result for the same query for an hour"""
+    # Log lines are returned with the data so a cache hit can replay them into the session's log
+    messages = []
+    data = NigerianStatsScraper(log=messages.append).scrape_nbs_website(search_query)
+    if data is None:
+        raise NBSScrapeFailed(messages)
+    return data, messages
+
+def dataframe_fingerprint(df):
+    """Cheap hash key for a DataFrame: shape, columns and a hash of its first and last 500 rows"""
+    return (
+        df.shape,
+        tuple(df.columns),
+        int(pd.util.hash_pandas_object(df.head(500), index=False).sum())
+        ^ int(pd.util.hash_pandas_object(df.tail(500), index=False).sum())
+    )
+
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+# Parquet needs pyarrow
+EXPORT_FORMATS = ["CSV", "JSON"] + (["Parquet"] if PYARROW_AVAILABLE else []) + ["Both"]
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_fingerprint}, show_spinner=False, max_entries=4)
+def dataframe_to_bytes(df, file_type="csv"):
+    """Serialize a DataFrame in memory for st.download_button"""
     if file_type == "csv":
-        csv = df.to_csv(index=False)
-        b64 = base64.b64encode(csv.encode()).decode()
-        href = f'<a href="data:file/csv;base64,{b64}" download="{filename}" target="_blank">📥 Download {filename}</a>'
-        return href
+        buffer = io.BytesIO()
+        if PYARROW_AVAILABLE:
+            try:
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+                return buffer.getvalue()
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # Columns mixing numbers and strings can't be converted to Arrow
+                buffer = io.BytesIO()
+        df.to_csv(buffer, index=False, chunksize=50_000)
+        return buffer.getvalue()
     elif file_type == "json":
-        json_str = df.to_json(orient='records', indent=2)
-        b64 = base64.b64encode(json_str.encode()).decode()
-        href = f'<a href="data:application/json;base64,{b64}" download="{filename}" target="_blank">📥 Download {filename}</a>'
-        return href
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                df.to_dict(orient='records'),
+                default=str,
+                # NBS tables without a header row have integer column labels
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        return df.to_json(orient='records', indent=2).encode('utf-8')
+    elif file_type == "parquet":
+        buffer = io.BytesIO()
+        try:
+            df.to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columns mixing numbers and strings are exported as text
+            buffer = io.BytesIO()
+            object_cols = df.select_dtypes(include='object').columns
+            df.astype({col: 'string' for col in object_cols}).to_parquet(
+                buffer, engine='pyarrow', compression='zstd', index=False
+            )
+        return buffer.getvalue()
+
+def encode_exports(df, file_types):
+    """Encode a DataFrame in several formats at once, filling the dataframe_to_bytes cache"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(file_types)) as executor:
+        return dict(zip(file_types, executor.map(lambda file_type: dataframe_to_bytes(df, file_type), file_types)))
+
+def download_button(df, filename, file_type="csv", **kwargs):
+    """Show a download button for a DataFrame"""
+    st.download_button(
+        label=f"📥 Download {filename}",
+        data=dataframe_to_bytes(df, file_type),
+        file_name=filename,
+        mime=EXPORT_MIME_TYPES[file_type],
+        **kwargs
+    )
 
 def show_google_drive_setup():
     """Show Google Drive setup interface"""
@@ -568,8 +674,24 @@ def show_google_drive_interface():
     else:
         st.info("ℹ️ No folder selected. Files will be saved to Google Drive root.")
 
+@st.cache_resource
+def ensure_directories():
+    """Create the app's working directories once per server process"""
+    os.makedirs("scraped_data", exist_ok=True)
+
+# Static page footer, rendered after the app on every run
+FOOTER_HTML = """
+    <div style="text-align: center; color: #666; padding: 2rem 0;">
+        <p><strong>Nigeria Statistics Web Scraper with Google Drive Integration</strong> • Version 3.0</p>
+        <p>🌐 <strong>Sources:</strong> Nigerian Statistics Bureau (nigerianstat.gov.ng) • National Population Commission • Central Bank of Nigeria</p>
+        <p>☁️ <strong>Storage:</strong> Google Drive integration for automatic cloud backup</p>
+        <p>🛠️ <strong>Technologies:</strong> Python, BeautifulSoup, Google Drive API, Streamlit</p>
+    </div>
+"""
+
 def main():
     """Main application function"""
+    ensure_directories()
     
     # Header
     st.markdown('<h1 class="main-header">🌐 Nigeria Statistics Web Scraper</h1>', unsafe_allow_html=True)
@@ -644,7 +766,7 @@ def show_web_scraper_interface():
         # Export format
         export_format = st.selectbox(
             "Export format:",
-            ["CSV", "JSON", "Both"]
+            EXPORT_FORMATS
         )
     
     # Scrape button
@@ -669,7 +791,13 @@ def show_web_scraper_interface():
                 progress_bar.progress(30)
                 time.sleep(1)  # Simulate delay
                 
-                nbs_data = scraper.scrape_nbs_website(query)
+                # NBS pages change daily at most, so a repeated query skips the download and parse
+                try:
+                    nbs_data, nbs_messages = cached_nbs_scrape(query)
+                except NBSScrapeFailed as e:
+                    nbs_data, nbs_messages = None, e.args[0]
+                for message in nbs_messages:
+                    log_entry(message)
                 
                 # Step 2: Scrape alternative sources
                 status_text.text("Step 2/3: Checking other sources...")
@@ -698,6 +826,10 @@ def show_web_scraper_interface():
                     
                     st.success(f"🎉 Successfully scraped {len(combined_data)} records!")
                     
+                    # Encode both formats side by side; the upload and download links reuse them
+                    if export_format == "Both":
+                        encode_exports(combined_data, ("csv", "json"))
+                    
                     # Auto-save to Google Drive
                     if auto_save_gdrive and st.session_state.google_drive_authenticated:
                         save_to_google_drive(combined_data, query, export_format)
@@ -724,7 +856,7 @@ def save_to_google_drive(dataframe, query, export_format):
         drive_manager.authenticate()
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_query = re.sub(r'[^\w\s-]', '', query.replace(' ', '_'))[:50]
+        safe_query = _UNSAFE_QUERY_RE.sub('', query.replace(' ', '_'))[:50]
         
         # Save CSV
         if export_format in ["CSV", "Both"]:
@@ -752,7 +884,7 @@ def save_to_google_drive(dataframe, query, export_format):
         # Save JSON
         if export_format in ["JSON", "Both"]:
             json_filename = f"nigeria_stats_{safe_query}_{timestamp}.json"
-            json_data = dataframe.to_json(orient='records', indent=2)
+            json_data = dataframe_to_bytes(dataframe, "json")
             
             # Convert JSON to file-like object
             file_metadata = {
@@ -764,7 +896,7 @@ def save_to_google_drive(dataframe, query, export_format):
                 file_metadata['parents'] = [st.session_state.google_drive_folder_id]
             
             media = MediaIoBaseUpload(
-                io.BytesIO(json_data.encode('utf-8')),
+                io.BytesIO(json_data),
                 mimetype='application/json',
                 resumable=True
             )
@@ -782,6 +914,30 @@ def save_to_google_drive(dataframe, query, export_format):
                 <a href="{file.get('webViewLink')}" target="_blank">🔗 Open in Google Drive</a>
             </div>
             """, unsafe_allow_html=True)
+        
+        # Save Parquet (columnar and compressed, a fraction of the CSV's upload size)
+        if export_format == "Parquet":
+            parquet_filename = f"nigeria_stats_{safe_query}_{timestamp}.parquet"
+            
+            result = drive_manager.upload_dataframe_to_drive(
+                dataframe,
+                parquet_filename,
+                "parquet",
+                st.session_state.google_drive_folder_id if st.session_state.google_drive_folder_id else None,
+                f"Nigeria Statistics Data - {query} - Scraped on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            )
+            
+            if result['success']:
+                st.markdown(f"""
+                <div class="google-drive-box">
+                    <strong>✅ Parquet saved to Google Drive!</strong><br>
+                    <strong>File:</strong> {result['file_name']}<br>
+                    <strong>Size:</strong> {result.get('file_size', 'N/A')}<br>
+                    <a href="{result['file_url']}" target="_blank">🔗 Open in Google Drive</a>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.warning(f"⚠️ Failed to save Parquet to Google Drive: {result['error']}")
             
     except Exception as e:
         st.error(f"❌ Error saving to Google Drive: {str(e)}")
@@ -791,21 +947,22 @@ def provide_download_links(dataframe, query, export_format):
     st.subheader("💾 Direct Download")
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_query = re.sub(r'[^\w\s-]', '', query.replace(' ', '_'))[:50]
+    safe_query = _UNSAFE_QUERY_RE.sub('', query.replace(' ', '_'))[:50]
     
     col1, col2 = st.columns(2)
     
     with col1:
         if export_format in ["CSV", "Both"]:
             csv_filename = f"nigeria_stats_{safe_query}_{timestamp}.csv"
-            csv_link = create_download_link(dataframe, csv_filename, "csv")
-            st.markdown(csv_link, unsafe_allow_html=True)
+            download_button(dataframe, csv_filename, "csv", key="download_csv")
     
     with col2:
         if export_format in ["JSON", "Both"]:
             json_filename = f"nigeria_stats_{safe_query}_{timestamp}.json"
-            json_link = create_download_link(dataframe, json_filename, "json")
-            st.markdown(json_link, unsafe_allow_html=True)
+            download_button(dataframe, json_filename, "json", key="download_json")
+        elif export_format == "Parquet":
+            parquet_filename = f"nigeria_stats_{safe_query}_{timestamp}.parquet"
+            download_button(dataframe, parquet_filename, "parquet", key="download_parquet")
     
     # Local save option
     st.subheader("💾 Save Locally")
@@ -817,12 +974,22 @@ def provide_download_links(dataframe, query, export_format):
     )
     
     if st.button("💾 Save to Local File", key="save_local"):
-        os.makedirs("scraped_data", exist_ok=True)
         filepath = f"scraped_data/{local_filename}"
-        dataframe.to_csv(filepath, index=False)
+        # Reuses the cached CSV bytes the download button serves
+        with open(filepath, 'wb') as f:
+            f.write(dataframe_to_bytes(dataframe, "csv"))
         st.success(f"✅ Data saved to: {filepath}")
         st.info(f"📁 Location: {os.path.abspath(filepath)}")
 
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_fingerprint}, show_spinner=False)
+def numeric_summary(df):
+    """describe() of the numeric columns, or None if there are none"""
+    try:
+        return df.describe(include='number')
+    except ValueError:
+        # describe() raises when there are no numeric columns to summarize
+        return None
+
 def show_data_view_interface():
     """Show data viewing and analysis interface"""
     st.header("📊 Scraped Data View")
@@ -868,7 +1035,9 @@ def show_data_view_interface():
                 filtered_df = filtered_df[filtered_df['Source'].isin(selected_sources)]
             
             if search_text:
-                mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_text, case=False, na=False)).any(axis=1)
+                # Compile once rather than once per column inside str.contains
+                search_re = re.compile(search_text, re.IGNORECASE)
+                mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_re, na=False)).any(axis=1)
                 filtered_df = filtered_df[mask]
             
             st.dataframe(filtered_df, use_container_width=True, height=300)
@@ -890,23 +1059,16 @@ def show_data_view_interface():
         # Quick analysis
         st.subheader("📈 Quick Analysis")
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) > 0:
+        summary = numeric_summary(df)
+        if summary is not None:
             st.write("Numeric columns summary:")
-            st.write(df[numeric_cols].describe())
+            st.write(summary)
         else:
             st.info("No numeric columns found for statistical analysis")
 
 # Footer
 st.markdown("---")
-st.markdown("""
-    <div style="text-align: center; color: #666; padding: 2rem 0;">
-        <p><strong>Nigeria Statistics Web Scraper with Google Drive Integration</strong> • Version 3.0</p>
-        <p>🌐 <strong>Sources:</strong> Nigerian Statistics Bureau (nigerianstat.gov.ng) • National Population Commission • Central Bank of Nigeria</p>
-        <p>☁️ <strong>Storage:</strong> Google Drive integration for automatic cloud backup</p>
-        <p>🛠️ <strong>Technologies:</strong> Python, BeautifulSoup, Google Drive API, Streamlit</p>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file